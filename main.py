@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 import sys
 import os
+import atexit
 import pygame
 import argparse
 from pygame.locals import *
@@ -11,6 +12,10 @@ from audio.sound_engine import SoundEngine, Note
 from practice_modes.regular_practice import PracticeMode
 from practice_modes.midi_practice import MIDIPracticeMode
 from midi_processing.midi_loader import MIDILoader
+from modules.utility.logging_setup import setup_logging
+
+# Window events after which the screen contents must be drawn again
+EXPOSE_EVENTS = (VIDEOEXPOSE, WINDOWEXPOSED, WINDOWSHOWN, WINDOWRESTORED)
 
 class EnhancedPianoTrainer:
     def __init__(self):
@@ -22,7 +27,22 @@ class EnhancedPianoTrainer:
         # Initialize screen
         self.screen_width = 1280
         self.screen_height = 720
-        self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+        try:
+            # A vsynced display makes each flip wait for the vertical blank,
+            # so the frame rate no longer needs a separate sleep
+            self.screen = pygame.display.set_mode(
+                (self.screen_width, self.screen_height), pygame.SCALED, vsync=1
+            )
+            self.vsync = True
+        except pygame.error:
+            self.screen = pygame.display.set_mode((self.screen_width, self.screen_height))
+            self.vsync = False
+        
+        # Only queue the event types handle_events reads, so mouse motion and
+        # other unused events don't pile up in the event queue. Expose events
+        # stay allowed so the window is repainted after being uncovered.
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed([QUIT, KEYDOWN, *EXPOSE_EVENTS])
         
         # Initialize clock for controlling frame rate
         self.clock = pygame.time.Clock()
@@ -50,6 +70,9 @@ class EnhancedPianoTrainer:
         ]
         self.selected_option = 0
         
+        # Selection currently shown on screen (None forces a full menu redraw)
+        self._drawn_menu_option = None
+        
         # Font for UI
         self.font = pygame.font.SysFont("Arial", 30)
         self.title_font = pygame.font.SysFont("Arial", 50, bold=True)
@@ -63,68 +86,122 @@ class EnhancedPianoTrainer:
         
         # Application state
         self.running = True
+        
+        # Menu option handlers, in the same order as self.menu_options
+        self._menu_actions = (
+            self._start_regular_practice,
+            self._start_midi_practice,
+            self._open_settings,
+            self._exit,
+        )
     
     def handle_events(self):
         """Handle pygame events."""
-        for event in pygame.event.get():
-            if event.type == QUIT:
-                self.running = False
-                
-            elif event.type == KEYDOWN:
-                if event.key == K_ESCAPE:
-                    if not self.in_menu:
-                        self.in_menu = True
-                    else:
-                        self.running = False
-                
-                # Menu navigation
-                if self.in_menu:
-                    if event.key == K_UP:
-                        self.selected_option = (self.selected_option - 1) % len(self.menu_options)
-                    elif event.key == K_DOWN:
-                        self.selected_option = (self.selected_option + 1) % len(self.menu_options)
-                    elif event.key == K_RETURN:
-                        self.execute_menu_option(self.selected_option)
+        # Pump once, then pull each handled event type with a filtered get. Every
+        # type allowed in __init__ is taken here, so nothing is left to clear.
+        pygame.event.pump()
+        
+        if pygame.event.get(QUIT, pump=False):
+            self.running = False
+        
+        # Practice modes redraw every frame; the menu only redraws what changed
+        if pygame.event.get(EXPOSE_EVENTS, pump=False):
+            self._drawn_menu_option = None
+        
+        for event in pygame.event.get(KEYDOWN, pump=False):
+            if event.key == K_ESCAPE:
+                if not self.in_menu:
+                    self.in_menu = True
                 else:
-                    # Pass events to active mode
-                    self.active_mode.handle_event(event)
+                    self.running = False
+            
+            # Menu navigation
+            if self.in_menu:
+                if event.key == K_UP:
+                    self.selected_option = (self.selected_option - 1) % len(self.menu_options)
+                elif event.key == K_DOWN:
+                    self.selected_option = (self.selected_option + 1) % len(self.menu_options)
+                elif event.key == K_RETURN:
+                    self.execute_menu_option(self.selected_option)
+            else:
+                # Pass events to active mode
+                self.active_mode.handle_event(event)
     
     def execute_menu_option(self, option):
         """Execute the selected menu option."""
-        if option == 0:  # Regular Practice
-            self.active_mode = self.regular_practice
-            self.in_menu = False
-        elif option == 1:  # MIDI Practice
-            self.active_mode = self.midi_practice
-            self.in_menu = False
-        elif option == 2:  # Settings
-            # Will implement settings later
-            pass
-        elif option == 3:  # Exit
-            self.running = False
+        self._menu_actions[option]()
+    
+    def _start_regular_practice(self):
+        """Switch to regular practice mode."""
+        self.active_mode = self.regular_practice
+        self.in_menu = False
+    
+    def _start_midi_practice(self):
+        """Switch to MIDI practice mode."""
+        self.active_mode = self.midi_practice
+        self.in_menu = False
+    
+    def _open_settings(self):
+        """Open the settings screen."""
+        # Will implement settings later
+        pass
+    
+    def _exit(self):
+        """Exit the application."""
+        self.running = False
     
     def draw_menu(self):
-        """Draw the main menu."""
-        self.screen.fill(self.BLACK)
-        
-        # Draw title
-        title = self.title_font.render("Enhanced Piano Trainer", True, self.WHITE)
-        title_rect = title.get_rect(center=(self.screen_width // 2, 100))
-        self.screen.blit(title, title_rect)
-        
-        # Draw menu options
-        for i, option in enumerate(self.menu_options):
-            color = self.LIGHT_BLUE if i == self.selected_option else self.WHITE
-            text = self.font.render(option, True, color)
-            text_rect = text.get_rect(center=(self.screen_width // 2, 250 + i * 60))
-            self.screen.blit(text, text_rect)
-        
-        # Draw instructions
-        instructions = self.font.render("Use UP/DOWN arrows to navigate, ENTER to select", True, self.GRAY)
-        instructions_rect = instructions.get_rect(center=(self.screen_width // 2, self.screen_height - 100))
-        self.screen.blit(instructions, instructions_rect)
-        
-        pygame.display.flip()
+        """Draw the main menu, redrawing only the options whose highlight changed."""
+        if self._drawn_menu_option == self.selected_option:
+            return
+        
+        if self._drawn_menu_option is None:
+            self.screen.fill(self.BLACK)
+            
+            # Draw title
+            title = self.title_font.render("Enhanced Piano Trainer", True, self.WHITE)
+            title_rect = title.get_rect(center=(self.screen_width // 2, 100))
+            self.screen.blit(title, title_rect)
+            
+            # Draw menu options
+            for i in range(len(self.menu_options)):
+                self._draw_menu_option(i)
+            
+            # Draw instructions
+            instructions = self.font.render("Use UP/DOWN arrows to navigate, ENTER to select", True, self.GRAY)
+            instructions_rect = instructions.get_rect(center=(self.screen_width // 2, self.screen_height - 100))
+            self.screen.blit(instructions, instructions_rect)
+            
+            pygame.display.flip()
+        else:
+            # Only the previously and newly selected options changed
+            dirty = [
+                self._draw_menu_option(self._drawn_menu_option),
+                self._draw_menu_option(self.selected_option),
+            ]
+            pygame.display.update(dirty)
+        
+        self._drawn_menu_option = self.selected_option
+    
+    def _draw_menu_option(self, index):
+        """
+        Draw a single menu option over a cleared row.
+        
+        Args:
+            index: Index of the option in self.menu_options
+            
+        Returns:
+            The screen area that was redrawn
+        """
+        row_rect = pygame.Rect(0, 0, self.screen_width, 60)
+        row_rect.center = (self.screen_width // 2, 250 + index * 60)
+        self.screen.fill(self.BLACK, row_rect)
+        
+        color = self.LIGHT_BLUE if index == self.selected_option else self.WHITE
+        text = self.font.render(self.menu_options[index], True, color)
+        text_rect = text.get_rect(center=row_rect.center)
+        self.screen.blit(text, text_rect)
+        return row_rect
     
     def run(self):
         """Main application loop."""
@@ -133,12 +210,21 @@ class EnhancedPianoTrainer:
             
             if self.in_menu:
                 self.draw_menu()
+                self.clock.tick(self.fps)
             else:
+                # The practice mode draws over the menu; redraw it fully on return
+                self._drawn_menu_option = None
+                
                 # Update and render active mode
                 self.active_mode.update()
                 self.active_mode.render()
-            
-            self.clock.tick(self.fps)
+                
+                # With vsync the flip already waits for the next frame
+                pygame.display.flip()
+                if self.vsync:
+                    self.clock.tick()
+                else:
+                    self.clock.tick(self.fps)
         
         # Cleanup
         pygame.quit()
@@ -156,6 +242,8 @@ def parse_arguments():
 
 if __name__ == "__main__":
     args = parse_arguments()
+    log_listener = setup_logging()
+    atexit.register(log_listener.stop)
     app = EnhancedPianoTrainer()
     
     # Handle command line arguments
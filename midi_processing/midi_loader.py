@@ -16,7 +16,7 @@ from mido import MidiFile, MidiTrack, Message
 # Setup logging
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class NoteEvent:
     """Represents a single MIDI note event with timing information"""
     note: int  # MIDI note number (0-127)
@@ -122,17 +122,20 @@ class MidiLoader:
         # Keep track of active notes to match note_on with note_off events
         active_notes: Dict[Tuple[int, int, int], Tuple[int, float]] = {}  # (track, channel, note) -> (velocity, start_time)
         
+        ticks_per_beat = self.current_midi.ticks_per_beat
+        
         # Process each track
         for track_idx, track in enumerate(self.current_midi.tracks):
             absolute_time = 0.0
+            # Seconds per tick, starting at the default 120 BPM; only changes on set_tempo
+            seconds_per_tick = 500000 * 1e-6 / ticks_per_beat
             
             for msg in track:
                 # Convert tick time to seconds
-                absolute_time += mido.tick2second(
-                    msg.time, 
-                    self.current_midi.ticks_per_beat, 
-                    self._get_tempo_at_time(absolute_time)
-                )
+                absolute_time += msg.time * seconds_per_tick
+                
+                if msg.type == 'set_tempo':
+                    seconds_per_tick = msg.tempo * 1e-6 / ticks_per_beat
                 
                 # Process note on events (with velocity > 0)
                 if msg.type == 'note_on' and msg.velocity > 0:
@@ -215,16 +218,15 @@ class MidiLoader:
 
         tempo_changes = []
         current_time = 0.0
-        current_tempo = 500000  # Default tempo (120 BPM)
+        ticks_per_beat = self.current_midi.ticks_per_beat
+        seconds_per_tick = 500000 * 1e-6 / ticks_per_beat  # Default tempo (120 BPM)
 
         for track in self.current_midi.tracks:
             for msg in track:
-                current_time += mido.tick2second(
-                    msg.time, self.current_midi.ticks_per_beat, current_tempo
-                )
+                current_time += msg.time * seconds_per_tick
                 if msg.type == "set_tempo":
-                    current_tempo = msg.tempo
-                    tempo_changes.append((current_time, current_tempo))
+                    seconds_per_tick = msg.tempo * 1e-6 / ticks_per_beat
+                    tempo_changes.append((current_time, msg.tempo))
 
         # Ensure tempo changes are sorted by time
         tempo_changes.sort()
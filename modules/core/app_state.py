@@ -5,6 +5,7 @@ This module handles the application's state, mode transitions, and global state
 It provides a centralized way to manage the application's current mode, settings, and state transitions.
 """
 
+from dataclasses import dataclass
 from enum import Enum, auto
 from typing import Dict, Any, Optional, Callable, List
 import logging
@@ -19,6 +20,46 @@ class AppMode(Enum):
     ANALYSIS = auto()   # Analysis view for MIDI files
 
 
+@dataclass(slots=True)
+class GlobalState:
+    """Application-wide state shared by all modes."""
+    is_playing: bool = False
+    current_midi_file: Optional[str] = None
+    active_notes: int = 0  # Bitmask of held MIDI notes (bit n = note n)
+    score: int = 0
+    midi_input_device: Optional[Any] = None
+    midi_output_device: Optional[Any] = None
+    current_tempo: int = 120
+    volume: int = 100
+
+
+@dataclass(slots=True)
+class FreestyleState:
+    """State specific to freestyle mode."""
+    show_note_names: bool = True
+    highlight_octaves: bool = False
+
+
+@dataclass(slots=True)
+class LearningState:
+    """State specific to learning mode."""
+    falling_speed: int = 5
+    note_hit_window: int = 150  # milliseconds
+    difficulty: str = "medium"
+    current_level: int = 1
+    mistakes: int = 0
+    success_rate: float = 0.0
+
+
+@dataclass(slots=True)
+class AnalysisState:
+    """State specific to analysis mode."""
+    show_note_statistics: bool = True
+    show_chord_analysis: bool = True
+    highlight_patterns: bool = True
+    current_position: int = 0
+
+
 class AppState:
     """
     Manages the application state, mode transitions, and global state.
@@ -42,37 +83,17 @@ class AppState:
         self.previous_mode = None
         
         # Global state variables
-        self.state: Dict[str, Any] = {
-            "is_playing": False,
-            "current_midi_file": None,
-            "active_notes": set(),
-            "score": 0,
-            "midi_input_device": None,
-            "midi_output_device": None,
-            "current_tempo": 120,
-            "volume": 100,
-        }
+        self.state = GlobalState()
         
         # Mode-specific state variables
-        self.mode_states: Dict[AppMode, Dict[str, Any]] = {
-            AppMode.FREESTYLE: {
-                "show_note_names": True,
-                "highlight_octaves": False,
-            },
-            AppMode.LEARNING: {
-                "falling_speed": config.get("learning.falling_speed", 5),
-                "note_hit_window": config.get("learning.note_hit_window", 150),  # milliseconds
-                "difficulty": config.get("learning.difficulty", "medium"),
-                "current_level": 1,
-                "mistakes": 0,
-                "success_rate": 0.0,
-            },
-            AppMode.ANALYSIS: {
-                "show_note_statistics": True,
-                "show_chord_analysis": True,
-                "highlight_patterns": True,
-                "current_position": 0,
-            }
+        self.mode_states: Dict[AppMode, Any] = {
+            AppMode.FREESTYLE: FreestyleState(),
+            AppMode.LEARNING: LearningState(
+                falling_speed=config.get("learning.falling_speed", 5),
+                note_hit_window=config.get("learning.note_hit_window", 150),
+                difficulty=config.get("learning.difficulty", "medium"),
+            ),
+            AppMode.ANALYSIS: AnalysisState(),
         }
         
         # Mode transition callbacks
@@ -123,19 +144,18 @@ class AppState:
         Returns:
             The state value or default if not found
         """
-        mode_state = self.mode_states.get(self.current_mode, {})
-        return mode_state.get(key, default)
+        return getattr(self.mode_states.get(self.current_mode), key, default)
     
     def set_mode_state(self, key: str, value: Any) -> None:
         """
         Set a mode-specific state value.
         
         Args:
-            key: The state key to set
+            key: The state key to set (a field of the current mode's state)
             value: The value to set
         """
         if self.current_mode in self.mode_states:
-            self.mode_states[self.current_mode][key] = value
+            setattr(self.mode_states[self.current_mode], key, value)
     
     def get_state(self, key: str, default: Any = None) -> Any:
         """
@@ -148,24 +168,72 @@ class AppState:
         Returns:
             The state value or default if not found
         """
-        return self.state.get(key, default)
+        return getattr(self.state, key, default)
     
     def set_state(self, key: str, value: Any) -> None:
         """
         Set a global state value.
         
         Args:
-            key: The state key to set
+            key: The state key to set (a field of GlobalState)
             value: The value to set
         """
-        self.state[key] = value
-        self.logger.debug("State updated: %s = %s", key, value)
+        setattr(self.state, key, value)
+        if self.logger.isEnabledFor(logging.DEBUG):
+            self.logger.debug("State updated: %s = %s", key, value)
+    
+    def handle_midi_note_on(self, note: int, velocity: int) -> None:
+        """
+        Mark a MIDI note as held.
+        
+        Args:
+            note: MIDI note number (0-127)
+            velocity: Note velocity (unused, kept for the MIDI input interface)
+        """
+        self.state.active_notes |= 1 << note
+    
+    def handle_midi_note_off(self, note: int) -> None:
+        """
+        Mark a MIDI note as released.
+        
+        Args:
+            note: MIDI note number (0-127)
+        """
+        self.state.active_notes &= ~(1 << note)
+    
+    def is_note_active(self, note: int) -> bool:
+        """
+        Check whether a MIDI note is currently held.
+        
+        Args:
+            note: MIDI note number (0-127)
+            
+        Returns:
+            True if the note is held, False otherwise
+        """
+        return (self.state.active_notes >> note) & 1 == 1
+    
+    def get_active_notes(self) -> List[int]:
+        """
+        Get the currently held MIDI notes in ascending order.
+        
+        Returns:
+            List of held MIDI note numbers
+        """
+        notes = []
+        mask = self.state.active_notes
+        while mask:
+            lowest_bit = mask & -mask
+            notes.append(lowest_bit.bit_length() - 1)
+            mask ^= lowest_bit
+        return notes
     
     def reset_score(self) -> None:
         """Reset the player's score."""
-        self.state["score"] = 0
-        self.mode_states[AppMode.LEARNING]["mistakes"] = 0
-        self.mode_states[AppMode.LEARNING]["success_rate"] = 0.0
+        self.state.score = 0
+        learning_state = self.mode_states[AppMode.LEARNING]
+        learning_state.mistakes = 0
+        learning_state.success_rate = 0.0
     
     def reset_to_defaults(self) -> None:
         """Reset all state values to their defaults."""
@@ -1,10 +1,15 @@
 import pygame
 import pygame.midi
+import numpy as np
+import array
+import threading
+import time
 from typing import Dict, List, Callable, Any, Optional, Tuple
 from enum import Enum, auto
 
 from modules.core.app_state import AppState, AppMode
 from modules.midi.midi_input import MIDIInput
+from modules.midi import _decode
 
 
 class EventType(Enum):
@@ -21,6 +26,13 @@ class EventType(Enum):
     TIMER = auto()
 
 
+# Maximum number of MIDI events buffered between two frames
+MIDI_QUEUE_SIZE = 4096
+
+# Interval between MIDI polls on the background thread, in seconds
+MIDI_POLL_INTERVAL = 0.0005
+
+
 class EventHandler:
     """
     Centralized event handler for the Piano Trainer application.
@@ -38,10 +50,31 @@ class EventHandler:
         self.midi_input = None
         self.running = True
         
-        # Dictionaries to store event callbacks
-        self._event_callbacks: Dict[EventType, List[Callable[[Any], None]]] = {
-            event_type: [] for event_type in EventType
-        }
+        # Ring buffer of timestamped MIDI events written by the polling thread, one
+        # (ns, status, data1, data2) row per event. The thread only advances the
+        # write index and the main thread only advances the read index.
+        self._midi_ring = np.zeros((MIDI_QUEUE_SIZE, 4), np.int64)
+        self._midi_write_index = 0
+        self._midi_read_index = 0
+        self._midi_thread: Optional[threading.Thread] = None
+        
+        # Connection state, set once on connect and cleared on driver errors
+        self._midi_connected = False
+        
+        # Arrival time (perf_counter_ns) of the MIDI event currently being dispatched
+        self.midi_event_time_ns = 0
+        
+        # Callback lists stored in a flat list indexed by EventType.value
+        self._event_callbacks: List[List[Callable[[Any], None]]] = [
+            [] for _ in range(max(event_type.value for event_type in EventType) + 1)
+        ]
+        
+        # Immutable snapshots of the callback lists used for dispatch,
+        # rebuilt whenever a callback is registered or unregistered
+        self._callback_tuples: List[Tuple[Callable[[Any], None], ...]] = [
+            () for _ in self._event_callbacks
+        ]
+        self._refresh_callback_tuples()
         
         # Key mapping for piano keys
         self.keyboard_to_note_mapping = {
@@ -50,8 +83,25 @@ class EventHandler:
             # ...
         }
         
+        # Dense lookup table from key code to MIDI note (-1 for non-piano keys),
+        # just long enough to cover the highest mapped key
+        self._key_to_note = array.array('b', [-1]) * (max(self.keyboard_to_note_mapping) + 1)
+        for key, note in self.keyboard_to_note_mapping.items():
+            self._key_to_note[key] = note
+        
+        # Prebuilt (note, velocity) payloads for fixed-velocity note events, indexed by note
+        self._key_note_on_payloads = [(note, 127) for note in range(128)]  # velocity 127 (max)
+        self._note_off_payloads = [(note, 0) for note in range(128)]  # velocity 0 (off)
+        
+        # Mouse motion is blocked in the pygame queue unless a MOUSE_MOVE callback
+        # is registered; the filter is (re)applied on the next process_events call
+        self._mouse_motion_filter_dirty = True
+        
         # Register default app-wide handlers
         self.register_callback(EventType.APP_QUIT, self._handle_quit)
+        
+        # Compile the MIDI decoder up front rather than on the first MIDI batch
+        _decode.warmup()
     
     def init_midi_input(self, device_id: Optional[int] = None):
         """
@@ -61,12 +111,67 @@ class EventHandler:
             device_id: Optional MIDI device ID to use. If None, will try to find a suitable device.
         """
         if pygame.midi.get_init():
-            self.midi_input = MIDIInput(device_id)
-            if self.midi_input.is_connected():
-                print(f"Connected to MIDI device: {self.midi_input.get_device_name()}")
+            self.midi_input = MIDIInput(self.app_state)
+            # The polling thread below is the device's only reader, so MIDIInput
+            # must not start its own listening thread
+            if self.midi_input.connect_to_device(device_id, listen=False):
+                print(f"Connected to MIDI device: {self.midi_input.connected_device_name}")
+                self._midi_connected = True
+                
+                # Poll the device off the render thread so events keep their real timing
+                self._midi_thread = threading.Thread(target=self._midi_poll_loop, daemon=True)
+                self._midi_thread.start()
             else:
                 print("Could not connect to MIDI device. Check connections and try again.")
     
+    def _midi_poll_loop(self):
+        """Thread function that polls MIDI input and queues timestamped events."""
+        ring = self._midi_ring
+        ring_size = len(ring)
+        # Reused for every batch so reads don't allocate a fresh array
+        messages = np.empty((ring_size, 4), np.int64)
+        midi_input = self.midi_input
+        while self.running and self._midi_connected:
+            # get_events() returns nothing without reading when the device has no pending data
+            try:
+                midi_events = midi_input.get_events()
+            except Exception as e:
+                self._on_midi_error(e)
+                break
+            if not midi_events:
+                # Only back off while idle so bursts are drained without delay
+                time.sleep(MIDI_POLL_INTERVAL)
+                continue
+            timestamp = time.perf_counter_ns()
+            
+            # Unpack the whole batch into (status, data1, data2, data3) columns at once.
+            # Only the newest ring_size events can be kept anyway.
+            count = len(midi_events)
+            kept = min(count, ring_size)
+            messages[:kept] = [midi_event[0] for midi_event in midi_events[count - kept:]]
+            
+            # Copy into the ring as at most two contiguous slices, split where it wraps
+            write_index = self._midi_write_index + count
+            start = (write_index - kept) % ring_size
+            first = min(kept, ring_size - start)
+            ring[start:start + first, 0] = timestamp
+            ring[start:start + first, 1:] = messages[:first, :3]
+            if first < kept:
+                ring[:kept - first, 0] = timestamp
+                ring[:kept - first, 1:] = messages[first:kept, :3]
+            # Publish the rows only after they are written
+            self._midi_write_index = write_index
+    
+    def _on_midi_error(self, error: Exception):
+        """
+        Stop polling MIDI input after a driver error (e.g. the device was unplugged).
+        
+        Args:
+            error: The exception raised by the MIDI driver
+        """
+        self._midi_connected = False
+        print(f"MIDI input error, stopped polling: {error}")
+    
     def register_callback(self, event_type: EventType, callback: Callable[[Any], None]):
         """
         Register a callback function for a specific event type.
@@ -75,8 +180,12 @@ class EventHandler:
             event_type: The type of event to register for
             callback: The function to call when the event occurs
         """
-        if callback not in self._event_callbacks[event_type]:
-            self._event_callbacks[event_type].append(callback)
+        callbacks = self._event_callbacks[event_type.value]
+        if callback not in callbacks:
+            callbacks.append(callback)
+            self._refresh_callback_tuples(event_type)
+            if event_type is EventType.MOUSE_MOVE:
+                self._mouse_motion_filter_dirty = True
     
     def unregister_callback(self, event_type: EventType, callback: Callable[[Any], None]):
         """
@@ -86,73 +195,162 @@ class EventHandler:
             event_type: The type of event to unregister from
             callback: The function to remove from callbacks
         """
-        if callback in self._event_callbacks[event_type]:
-            self._event_callbacks[event_type].remove(callback)
+        callbacks = self._event_callbacks[event_type.value]
+        if callback in callbacks:
+            callbacks.remove(callback)
+            self._refresh_callback_tuples(event_type)
+            if event_type is EventType.MOUSE_MOVE:
+                self._mouse_motion_filter_dirty = True
+    
+    def _refresh_callback_tuples(self, event_type: Optional[EventType] = None):
+        """
+        Rebuild the dispatch tuple for an event type and the cached note callbacks.
+        
+        Args:
+            event_type: The event type whose callbacks changed, or None to rebuild all
+        """
+        if event_type is None:
+            self._callback_tuples = [tuple(callbacks) for callbacks in self._event_callbacks]
+        else:
+            self._callback_tuples[event_type.value] = tuple(self._event_callbacks[event_type.value])
+        
+        # Direct references for the hot dispatch paths
+        self._cb_note_on = self._callback_tuples[EventType.MIDI_NOTE_ON.value]
+        self._cb_note_off = self._callback_tuples[EventType.MIDI_NOTE_OFF.value]
+        self._cb_control_change = self._callback_tuples[EventType.MIDI_CONTROL_CHANGE.value]
+    
+    def _update_mouse_motion_filter(self):
+        """Block or allow MOUSEMOTION in the pygame queue depending on whether anyone listens for it."""
+        if self._event_callbacks[EventType.MOUSE_MOVE.value]:
+            pygame.event.set_allowed(pygame.MOUSEMOTION)
+        else:
+            pygame.event.set_blocked(pygame.MOUSEMOTION)
+        self._mouse_motion_filter_dirty = False
     
     def process_events(self):
         """Process all pending events in the queue."""
         try:
-            for event in pygame.event.get():
-                # Handle pygame events
-                if event.type == pygame.QUIT:
-                    self._trigger_event(EventType.APP_QUIT, None)
-                
-                elif event.type == pygame.KEYDOWN:
-                    # Handle keyboard input for piano keys
-                    if event.key in self.keyboard_to_note_mapping:
-                        note = self.keyboard_to_note_mapping[event.key]
-                        self._trigger_event(EventType.MIDI_NOTE_ON, (note, 127))  # velocity 127 (max)
-                    
-                    # App control keys
-                    elif event.key == pygame.K_ESCAPE:
-                        self._trigger_event(EventType.APP_QUIT, None)
-                    elif event.key == pygame.K_1:
-                        self.app_state.set_mode(AppMode.FREESTYLE)
-                        self._trigger_event(EventType.MODE_CHANGE, AppMode.FREESTYLE)
-                    elif event.key == pygame.K_2:
-                        self.app_state.set_mode(AppMode.LEARNING)
-                        self._trigger_event(EventType.MODE_CHANGE, AppMode.LEARNING)
-                    elif event.key == pygame.K_3:
-                        self.app_state.set_mode(AppMode.ANALYSIS)
-                        self._trigger_event(EventType.MODE_CHANGE, AppMode.ANALYSIS)
-                    
-                    # General key press event
-                    self._trigger_event(EventType.KEY_PRESS, event)
+            if self._mouse_motion_filter_dirty:
+                self._update_mouse_motion_filter()
+            
+            # Pull events one at a time; poll() returns NOEVENT once the queue is empty,
+            # so idle frames don't build an event list at all
+            pygame.event.pump()
+            poll = pygame.event.poll
+            key_to_note = self._key_to_note
+            while True:
+                event = poll()
+                event_type = event.type
+                if event_type == pygame.NOEVENT:
+                    break
                 
-                elif event.type == pygame.KEYUP:
+                if event_type == pygame.KEYDOWN:
+                    self._handle_key_down(event)
+                elif event_type == pygame.KEYUP:
                     # Handle releasing piano keys
-                    if event.key in self.keyboard_to_note_mapping:
-                        note = self.keyboard_to_note_mapping[event.key]
-                        self._trigger_event(EventType.MIDI_NOTE_OFF, (note, 0))  # velocity 0 (off)
+                    note = key_to_note[event.key] if event.key < len(key_to_note) else -1
+                    if note >= 0:
+                        data = self._note_off_payloads[note]
+                        for callback in self._cb_note_off:
+                            callback(data)
                     
                     # General key release event
                     self._trigger_event(EventType.KEY_RELEASE, event)
-                
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    self._trigger_event(EventType.MOUSE_CLICK, event)
-                
-                elif event.type == pygame.MOUSEMOTION:
+                elif event_type == pygame.MOUSEMOTION:
                     self._trigger_event(EventType.MOUSE_MOVE, event)
+                elif event_type == pygame.MOUSEBUTTONDOWN:
+                    self._trigger_event(EventType.MOUSE_CLICK, event)
+                elif event_type == pygame.QUIT:
+                    self._trigger_event(EventType.APP_QUIT, None)
             
-            # Process MIDI input if available
-            if self.midi_input and self.midi_input.is_connected():
-                for midi_event in self.midi_input.get_events():
-                    status, data1, data2 = midi_event[0][:3]
-                    
-                    # Note on event (status byte: 0x9n where n is the MIDI channel)
-                    if status >= 0x90 and status <= 0x9F and data2 > 0:
-                        self._trigger_event(EventType.MIDI_NOTE_ON, (data1, data2))
-                    
-                    # Note off event (status byte: 0x8n or 0x9n with velocity 0)
-                    elif (status >= 0x80 and status <= 0x8F) or (status >= 0x90 and status <= 0x9F and data2 == 0):
-                        self._trigger_event(EventType.MIDI_NOTE_OFF, (data1, 0))
-                    
-                    # Control change event (status byte: 0xBn)
-                    elif status >= 0xB0 and status <= 0xBF:
-                        self._trigger_event(EventType.MIDI_CONTROL_CHANGE, (data1, data2))
+            # Drain MIDI events buffered by the polling thread
+            write_index = self._midi_write_index
+            read_index = self._midi_read_index
+            if write_index != read_index:
+                # If a whole buffer's worth arrived since the last frame, the oldest were overwritten
+                read_index = max(read_index, write_index - MIDI_QUEUE_SIZE)
+                midi_events = self._midi_ring[np.arange(read_index, write_index) % MIDI_QUEUE_SIZE]
+                self._midi_read_index = write_index
+                self._process_midi_events(midi_events)
         except Exception as e:
             print(f"Error processing event: {e}")
     
+    def _handle_key_down(self, event):
+        """
+        Handle a single KEYDOWN event.
+        
+        Args:
+            event: The pygame KEYDOWN event
+        """
+        # Handle keyboard input for piano keys
+        key_to_note = self._key_to_note
+        note = key_to_note[event.key] if event.key < len(key_to_note) else -1
+        if note >= 0:
+            data = self._key_note_on_payloads[note]
+            for callback in self._cb_note_on:
+                callback(data)
+        
+        # App control keys
+        elif event.key == pygame.K_ESCAPE:
+            self._trigger_event(EventType.APP_QUIT, None)
+        elif event.key == pygame.K_1:
+            self.app_state.set_mode(AppMode.FREESTYLE)
+            self._trigger_event(EventType.MODE_CHANGE, AppMode.FREESTYLE)
+        elif event.key == pygame.K_2:
+            self.app_state.set_mode(AppMode.LEARNING)
+            self._trigger_event(EventType.MODE_CHANGE, AppMode.LEARNING)
+        elif event.key == pygame.K_3:
+            self.app_state.set_mode(AppMode.ANALYSIS)
+            self._trigger_event(EventType.MODE_CHANGE, AppMode.ANALYSIS)
+        
+        # General key press event
+        self._trigger_event(EventType.KEY_PRESS, event)
+    
+    def _process_midi_events(self, midi_events: np.ndarray):
+        """
+        Decode a batch of buffered MIDI events and trigger the matching callbacks.
+        
+        The status/data bytes of the whole batch are classified by the MIDI
+        decoder; only the relevant events are then dispatched, in arrival order.
+        
+        Args:
+            midi_events: int64 array of (timestamp_ns, status, data1, data2) rows from the polling thread
+        """
+        if len(midi_events) == 0:
+            return
+        
+        # Contiguous byte columns for the decoder
+        timestamps = midi_events[:, 0]
+        status = midi_events[:, 1].astype(np.uint8)
+        data1 = midi_events[:, 2].astype(np.uint8)
+        data2 = midi_events[:, 3].astype(np.uint8)
+        note_on_idx, note_off_idx, cc_idx = _decode.decode_midi(status, data1, data2)
+        
+        # Merge the per-kind index arrays back into arrival order
+        kind = np.zeros(len(status), np.uint8)
+        kind[note_on_idx] = 1
+        kind[note_off_idx] = 2
+        kind[cc_idx] = 3
+        indices = np.flatnonzero(kind)
+        if indices.size == 0:
+            return
+        
+        note_on_callbacks = self._cb_note_on
+        note_off_callbacks = self._cb_note_off
+        control_change_callbacks = self._cb_control_change
+        note_off_payloads = self._note_off_payloads
+        for t, k, d1, d2 in zip(timestamps[indices].tolist(), kind[indices].tolist(),
+                                data1[indices].tolist(), data2[indices].tolist()):
+            self.midi_event_time_ns = t
+            if k == 1:
+                callbacks, data = note_on_callbacks, (d1, d2)
+            elif k == 2:
+                callbacks, data = note_off_callbacks, note_off_payloads[d1]
+            else:
+                callbacks, data = control_change_callbacks, (d1, d2)
+            for callback in callbacks:
+                callback(data)
+    
     def _trigger_event(self, event_type: EventType, data: Any):
         """
         Trigger callbacks for a specific event type.
@@ -161,14 +359,16 @@ class EventHandler:
             event_type: The type of event that occurred
             data: The data associated with the event
         """
-        for callback in self._event_callbacks[event_type]:
+        for callback in self._callback_tuples[event_type.value]:
             callback(data)
     
     def _handle_quit(self, _):
         """Handle application quit event."""
         self.running = False
-        if self.midi_input:
-            self.midi_input.close()
+        if self._midi_thread is not None and self._midi_thread.is_alive():
+            self._midi_thread.join(timeout=1.0)
+        if self.midi_input is not None:
+            self.midi_input.disconnect()
     
     def is_running(self) -> bool:
         """
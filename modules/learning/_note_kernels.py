@@ -0,0 +1,123 @@
+"""
+Falling Note Kernels
+
+This module advances the falling notes of the learning mode by one frame, working
+on the per-note arrays kept by NoteGenerator. When Numba is installed the step is
+JIT-compiled into a single fused loop that releases the GIL, so it can overlap
+rendering when update() runs on a worker thread; otherwise an equivalent NumPy
+version is used.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    njit = None
+
+
+# Status codes, matching NoteStatus values in note_generator
+FALLING = 0
+HIT = 1
+MISSED = 2
+WRONG = 3
+EXPIRED = 4
+
+# Seconds a hit/missed/wrong note stays on screen before it is removed
+FINISHED_DISPLAY_TIME = 0.5
+
+
+def _step_notes_loop(start_time, y_pos, status, hit_time, current_time, fall_speed,
+                     target_y, screen_height):
+    """
+    Advance all active notes by one frame in a single pass.
+
+    y_pos, status and hit_time are updated in place.
+
+    Args:
+        start_time: float64 array of note onsets
+        y_pos: float64 array of note positions
+        status: uint8 array of note status codes
+        hit_time: float64 array of the times notes stopped falling
+        current_time: Current time in seconds
+        fall_speed: Fall speed in pixels per second
+        target_y: Y position at which a falling note counts as missed
+        screen_height: Y position below which a falling note expires
+
+    Returns:
+        Tuple of (expired_idx, missed_idx, remove) where the index arrays list
+        the notes that expired or were missed this frame and remove is a
+        boolean mask of notes to drop
+    """
+    n = status.shape[0]
+    expired_idx = np.empty(n, np.int64)
+    missed_idx = np.empty(n, np.int64)
+    remove = np.zeros(n, np.bool_)
+    n_expired = 0
+    n_missed = 0
+
+    for i in range(n):
+        s = status[i]
+        if s == FALLING:
+            y = (current_time - start_time[i]) * fall_speed
+            y_pos[i] = y
+            if y > screen_height:
+                status[i] = EXPIRED
+                expired_idx[n_expired] = i
+                n_expired += 1
+                remove[i] = True
+            elif y >= target_y:
+                status[i] = MISSED
+                hit_time[i] = current_time
+                missed_idx[n_missed] = i
+                n_missed += 1
+        elif s == HIT or s == MISSED or s == WRONG:
+            if current_time - hit_time[i] > FINISHED_DISPLAY_TIME:
+                remove[i] = True
+
+    return expired_idx[:n_expired], missed_idx[:n_missed], remove
+
+
+def _step_notes_numpy(start_time, y_pos, status, hit_time, current_time, fall_speed,
+                      target_y, screen_height):
+    """
+    Advance all active notes by one frame with vectorized masks (fallback without Numba).
+
+    Args:
+        start_time: float64 array of note onsets
+        y_pos: float64 array of note positions
+        status: uint8 array of note status codes
+        hit_time: float64 array of the times notes stopped falling
+        current_time: Current time in seconds
+        fall_speed: Fall speed in pixels per second
+        target_y: Y position at which a falling note counts as missed
+        screen_height: Y position below which a falling note expires
+
+    Returns:
+        Tuple of (expired_idx, missed_idx, remove), see _step_notes_loop
+    """
+    falling = status == FALLING
+    y = (current_time - start_time) * fall_speed
+    y_pos[falling] = y[falling]
+
+    expired = falling & (y > screen_height)
+    missed = falling & ~expired & (y >= target_y)
+    finished = (status == HIT) | (status == MISSED) | (status == WRONG)
+    remove = expired | (finished & (current_time - hit_time > FINISHED_DISPLAY_TIME))
+
+    status[expired] = EXPIRED
+    status[missed] = MISSED
+    hit_time[missed] = current_time
+    return np.flatnonzero(expired), np.flatnonzero(missed), remove
+
+
+if njit is not None:
+    step_notes = njit(cache=True, fastmath=True, nogil=True)(_step_notes_loop)
+else:
+    step_notes = _step_notes_numpy
+
+
+def warmup():
+    """Run the note step once so JIT compilation doesn't happen on the first frame."""
+    empty = np.zeros(0, np.float64)
+    step_notes(empty, empty.copy(), np.zeros(0, np.uint8), empty.copy(), 0.0, 1.0, 1.0, 1.0)
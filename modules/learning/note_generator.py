@@ -1,10 +1,32 @@
+import bisect
 import pygame
 import random
+from collections import defaultdict, deque
 from typing import List, Dict, Tuple, Optional, Set
 import time
 import numpy as np
 from enum import Enum
 
+from modules.learning import _note_kernels
+
+
+# Column layout of the upcoming-note table, one row per note sorted by onset
+NOTE_TABLE_DTYPE = np.dtype(
+    [("pitch", "u1"), ("onset", "f8"), ("duration", "f8"), ("velocity", "u1")]
+)
+
+# Note colors by outcome, shared by every Note
+COLOR_FALLING = (100, 149, 237)  # Cornflower blue
+COLOR_PERFECT = (0, 255, 0)  # Green for perfect
+COLOR_GOOD = (255, 255, 0)  # Yellow for good
+COLOR_HIT = (255, 165, 0)  # Orange for hit but timing off
+COLOR_WRONG = (255, 0, 0)  # Red for wrong note
+COLOR_MISSED = (128, 128, 128)  # Gray for missed
+
+# Points awarded per hit quality
+PERFECT_SCORE = 100
+GOOD_SCORE = 50
+HIT_SCORE = 25
 
 class NoteStatus(Enum):
     """Enumeration of possible note statuses."""
@@ -19,6 +41,30 @@ class NoteStatus(Enum):
 class Note:
     """Class representing a single falling note in the learning mode."""
 
+    # Timing window for "perfect" and "good" hits
+    perfect_window = 0.05  # seconds
+    good_window = 0.15  # seconds
+
+    # A song creates one Note per MIDI note, so skip the per-instance __dict__
+    __slots__ = (
+        "note_number",
+        "start_time",
+        "speed",
+        "screen_height",
+        "target_y",
+        "velocity",
+        "duration",
+        "status",
+        "color",
+        "hit_time",
+        "y",
+        "y_pos",
+        "height",
+        "hit",
+        "missed",
+        "_expected_time",
+    )
+
     def __init__(
         self,
         note_number,
@@ -43,23 +89,30 @@ class Note:
         """
         self.note_number = note_number
         self.start_time = start_time
-        self.speed = speed
         self.screen_height = screen_height
         self.target_y = target_y
         self.velocity = velocity
         self.duration = duration
         self.status = NoteStatus.FALLING
-        self.color = (100, 149, 237)  # Cornflower blue
+        self.color = COLOR_FALLING
         self.hit_time = None
+        self.y = 0
         self.y_pos = 0  # y position
         self.height = 20
         self.hit = False
         self.missed = False
-        self.should_be_removed = False
+        self.set_speed(speed)
 
-        # Timing window for "perfect" and "good" hits
-        self.perfect_window = 0.05  # seconds
-        self.good_window = 0.15  # seconds
+    def set_speed(self, speed):
+        """
+        Change the fall speed of the note.
+
+        Args:
+            speed (float): Speed of the falling note in pixels per second
+        """
+        self.speed = speed
+        # Seconds from onset until the note reaches the target line
+        self._expected_time = self.target_y / speed if speed else 0.0
 
     def update(self, current_time):
         """
@@ -71,7 +124,7 @@ class Note:
         Returns:
             bool: True if the note is still active, False if it should be removed
         """
-        if self.status == NoteStatus.FALLING:
+        if self.status is NoteStatus.FALLING:
             # Calculate the y position based on elapsed time
             elapsed = current_time - self.start_time
             self.y = elapsed * self.speed
@@ -102,13 +155,12 @@ class Note:
                    "perfect", "good", "miss", "wrong", or None
                    and score is the point value (0 for miss/wrong)
         """
-        if self.status != NoteStatus.FALLING:
+        if self.status is not NoteStatus.FALLING:
             return None, 0
 
         # Calculate timing error (distance from target)
         elapsed = current_time - self.start_time
-        expected_time = self.target_y / self.speed
-        timing_error = abs(elapsed - expected_time)
+        timing_error = abs(elapsed - self._expected_time)
 
         # Check if the correct note was played
         if note_number == self.note_number:
@@ -118,21 +170,21 @@ class Note:
             # Check timing
             if timing_error <= self.perfect_window:
                 self.status = NoteStatus.HIT
-                self.color = (0, 255, 0)  # Green for perfect
-                return "perfect", 100
+                self.color = COLOR_PERFECT
+                return "perfect", PERFECT_SCORE
             elif timing_error <= self.good_window:
                 self.status = NoteStatus.HIT
-                self.color = (255, 255, 0)  # Yellow for good
-                return "good", 50
+                self.color = COLOR_GOOD
+                return "good", GOOD_SCORE
             else:
                 # Too early or too late, but still the right note
                 self.status = NoteStatus.HIT
-                self.color = (255, 165, 0)  # Orange for hit but timing off
-                return "hit", 25
+                self.color = COLOR_HIT
+                return "hit", HIT_SCORE
         else:
             # Wrong note
             self.status = NoteStatus.WRONG
-            self.color = (255, 0, 0)  # Red for wrong note
+            self.color = COLOR_WRONG
             self.hit_time = current_time
             return "wrong", 0
 
@@ -143,10 +195,10 @@ class Note:
         Args:
             current_time (float): Current time in seconds
         """
-        if self.status == NoteStatus.FALLING:
+        if self.status is NoteStatus.FALLING:
             self.status = NoteStatus.MISSED
             self.missed = True
-            self.color = (128, 128, 128)  # Gray for missed
+            self.color = COLOR_MISSED
             self.hit_time = current_time
 
     def update_position(
@@ -207,11 +259,24 @@ class NoteGenerator:
         # Speed of falling notes in pixels per second
         self.note_speed = 200  # Adjust based on difficulty
 
-        # List of active falling notes
-        self.active_notes = []
+        # List of active falling notes, used as views for rendering and hit checks.
+        # Per-frame timing runs on parallel arrays kept in the same order.
+        self._clear_active_notes()
 
-        # Queue of upcoming notes from the MIDI file
+        # Queue of upcoming notes from the MIDI file, sorted by start time.
+        # Notes before self._next_note_index have already been activated.
         self.note_queue = []
+        self._next_note_index = 0
+
+        # Structured array mirroring note_queue, plus its onsets as a plain list
+        # for scalar binary searches
+        self._note_table = np.zeros(0, dtype=NOTE_TABLE_DTYPE)
+        self._note_onsets: List[float] = []
+
+        # The note table as (note_number, start_time, velocity, duration) tuples and
+        # the midi_data it came from, so restarting a song skips the parse
+        self._note_template: Optional[List[Tuple[int, float, int, float]]] = None
+        self._template_source = None
 
         # Track learning mode stats
         self.score = 0
@@ -231,34 +296,150 @@ class NoteGenerator:
         self.fall_distance = self.target_y
         self.fall_speed = self.note_speed
 
+        # Scalar arguments of the per-frame note step, converted once
+        self._step_params = (
+            float(self.note_speed),
+            float(self.target_y),
+            float(self.screen_height),
+        )
+
+        # Compile the per-frame note step up front rather than on the first frame
+        _note_kernels.warmup()
+
         # Initialize the note queue from midi data
         self._parse_midi_data()
 
-    def _parse_midi_data(self):
-        """Parse MIDI data to create upcoming notes."""
-        self.note_queue = []
+    def set_fall_speed(self, speed: float):
+        """
+        Change the speed of the falling notes.
+
+        Args:
+            speed: Fall speed in pixels per second
+        """
+        self.note_speed = speed
+        self.fall_speed = speed
+        self._step_params = (float(speed), float(self.target_y), float(self.screen_height))
+        for note in self.note_queue:
+            note.set_speed(speed)
+
+    def _clear_active_notes(self):
+        """Reset active_notes and the per-note arrays and index that mirror it."""
+        self.active_notes = []
+        # Active notes by pitch in activation order, for hit lookups
+        self._notes_by_pitch: Dict[int, deque] = defaultdict(deque)
+        self._active_start = np.zeros(0, np.float64)
+        self._active_pitch = np.zeros(0, np.uint8)
+        self._active_y = np.zeros(0, np.float64)
+        self._active_status = np.zeros(0, np.uint8)
+        self._active_hit_time = np.zeros(0, np.float64)
+        # Set when a Note changes status outside update() (e.g. a hit)
+        self._status_dirty = False
+
+    def _sync_active_status(self):
+        """Reload the status arrays from the Note objects after outside changes."""
+        active = self.active_notes
+        count = len(active)
+        self._active_status = np.fromiter(
+            (note.status.value for note in active), np.uint8, count
+        )
+        self._active_hit_time = np.fromiter(
+            (note.hit_time or 0.0 for note in active), np.float64, count
+        )
+        self._status_dirty = False
 
-        for event in self.midi_player.midi_data:
-            if event["type"] == "note_on" and event["velocity"] > 0:
-                note = Note(
-                    note_number=event["note"],
-                    start_time=event["time"],
-                    speed=self.note_speed,
-                    screen_height=self.screen_height,
-                    target_y=self.target_y,
-                    velocity=event["velocity"],
-                    duration=0.5,  # Default, will be updated
+    def _parse_midi_data(self):
+        """Create the upcoming notes, parsing the MIDI data only if it changed."""
+        midi_data = self.midi_player.midi_data
+        if self._note_template is None or midi_data is not self._template_source:
+            table = self._build_note_table(midi_data)
+            self._note_table = table
+            self._note_onsets = table["onset"].tolist()
+            self._note_template = list(
+                zip(
+                    table["pitch"].tolist(),
+                    self._note_onsets,
+                    table["velocity"].tolist(),
+                    table["duration"].tolist(),
                 )
-                self.note_queue.append(note)
+            )
+            self._template_source = midi_data
+
+        # Notes carry per-play state, so each run gets fresh ones
+        self.note_queue = [
+            Note(
+                note_number,
+                start_time,
+                self.note_speed,
+                self.screen_height,
+                self.target_y,
+                velocity,
+                duration,
+            )
+            for note_number, start_time, velocity, duration in self._note_template
+        ]
+        self._next_note_index = 0
+
+    def _build_note_table(self, midi_data) -> np.ndarray:
+        """
+        Parse MIDI events into a note table sorted by start time.
+
+        Args:
+            midi_data: Iterable of MIDI event dicts with "type", "note", "velocity" and "time"
+
+        Returns:
+            Structured array of NOTE_TABLE_DTYPE, one row per note
+        """
+        # One Python pass to pull the note events into columns; the rest is array work
+        events = [
+            (
+                event["note"],
+                event.get("velocity", 0),
+                event["time"],
+                event["type"] == "note_on",
+            )
+            for event in midi_data
+            if event["type"] == "note_on" or event["type"] == "note_off"
+        ]
+        if not events:
+            return np.zeros(0, dtype=NOTE_TABLE_DTYPE)
+        pitch, velocity, times, on_type = (np.array(column) for column in zip(*events))
+
+        # note_on with velocity 0 is a note off as well
+        is_on = on_type & (velocity > 0)
+
+        # A note off ends the most recent pending note on of its pitch, which is
+        # exactly the event before it when events are grouped by pitch in order
+        by_pitch = np.argsort(pitch, kind="stable")
+        same_pitch = pitch[by_pitch[1:]] == pitch[by_pitch[:-1]]
+        paired = same_pitch & is_on[by_pitch[:-1]] & ~is_on[by_pitch[1:]]
+        note_ons = by_pitch[:-1][paired]
+        note_offs = by_pitch[1:][paired]
+
+        # Duration defaults to 0.5 s, kept if no note off follows
+        duration = np.full(len(events), 0.5)
+        duration[note_ons] = times[note_offs] - times[note_ons]
 
         # Sort by time
-        self.note_queue.sort(key=lambda x: x.start_time)
+        notes = np.flatnonzero(is_on)
+        notes = notes[np.argsort(times[notes], kind="stable")]
 
-    def start(self):
-        """Start the note generator and reset statistics."""
-        self.start_time = time.time()
+        table = np.zeros(len(notes), dtype=NOTE_TABLE_DTYPE)
+        table["pitch"] = pitch[notes]
+        table["onset"] = times[notes]
+        table["duration"] = duration[notes]
+        table["velocity"] = velocity[notes]
+        return table
+
+    def start(self, now: Optional[float] = None):
+        """
+        Start the note generator and reset statistics.
+
+        Args:
+            now: Current time.monotonic() timestamp, if the caller already has one
+        """
+        self.start_time = time.monotonic() if now is None else now
         self.current_time = self.start_time
-        self.active_notes = []
+        self._clear_active_notes()
 
         # Reset stats
         self.score = 0
@@ -288,44 +469,104 @@ class NoteGenerator:
         # Update current time
         self.current_time += delta_time
 
+        # Nothing on screen and nothing left to come (e.g. after the song ends)
+        if not self.active_notes and self._next_note_index >= len(self.note_queue):
+            return
+
         # Check for new notes to activate
         self._activate_new_notes()
 
-        # Update positions of active notes
-        for note in self.active_notes:
-            note.update(self.current_time)
-
-            # Check if note has reached the piano (bottom of screen)
-            if note.y >= self.target_y and note.status == NoteStatus.FALLING:
-                note.mark_as_missed(self.current_time)
-                self.misses += 1
-
-            # Check if note should be removed (it's no longer active)
-            if not note.update(self.current_time):
-                note.should_be_removed = True
+        active = self.active_notes
+        if not active:
+            return
+        if self._status_dirty:
+            self._sync_active_status()
+
+        # Positions, misses, expiry and removal for all notes in one fused pass
+        current_time = self.current_time
+        expired_idx, missed_idx, remove = _note_kernels.step_notes(
+            self._active_start,
+            self._active_y,
+            self._active_status,
+            self._active_hit_time,
+            current_time,
+            *self._step_params,
+        )
+
+        # Mirror this frame's status changes onto the Note objects
+        y = self._active_y
+        expired = NoteStatus.EXPIRED
+        for i, note_y in zip(expired_idx.tolist(), y[expired_idx].tolist()):
+            note = active[i]
+            note.y_pos = note.y = note_y
+            note.status = expired
+        for i, note_y in zip(missed_idx.tolist(), y[missed_idx].tolist()):
+            note = active[i]
+            note.y_pos = note.y = note_y
+            note.mark_as_missed(current_time)
+        self.misses += len(missed_idx)
 
         # Remove notes that should be removed
-        self.active_notes = [
-            note for note in self.active_notes if not note.should_be_removed
-        ]
+        if remove.any():
+            keep = ~remove
+
+            # Finished notes form a prefix of each pitch's deque, so drop them
+            # there too rather than leaving them for the next key press
+            notes_by_pitch = self._notes_by_pitch
+            falling = NoteStatus.FALLING
+            for pitch in np.unique(self._active_pitch[remove]).tolist():
+                pending = notes_by_pitch[pitch]
+                while pending and pending[0].status is not falling:
+                    pending.popleft()
+                if not pending:
+                    del notes_by_pitch[pitch]
+
+            # Compact the list in place so its storage is reused across frames
+            write = 0
+            for read, kept in enumerate(keep.tolist()):
+                if kept:
+                    active[write] = active[read]
+                    write += 1
+            del active[write:]
+
+            self._active_start = self._active_start[keep]
+            self._active_pitch = self._active_pitch[keep]
+            self._active_y = self._active_y[keep]
+            self._active_status = self._active_status[keep]
+            self._active_hit_time = self._active_hit_time[keep]
 
     def _activate_new_notes(self):
         """Check for new notes to activate based on the current time."""
-        # Look for notes that should start falling now
-        new_active_notes = []
-        remaining_upcoming = []
-
-        for note in self.note_queue:
-            # If the note should start falling now
-            if note.start_time <= self.current_time:
-                new_active_notes.append(note)
-            else:
-                remaining_upcoming.append(note)
+        # Notes are sorted by onset, so everything due is a contiguous run
+        # starting at the next unactivated note
+        start = self._next_note_index
+        onsets = self._note_onsets
+        current_time = self.current_time
+
+        # Most frames activate nothing, which a single comparison settles
+        if start >= len(onsets) or onsets[start] > current_time:
+            return
 
-        # Add new active notes
-        self.active_notes.extend(new_active_notes)
-        # Update upcoming notes list
-        self.note_queue = remaining_upcoming
+        due_end = bisect.bisect_right(onsets, current_time, start)
+        count = due_end - start
+        new_notes = self.note_queue[start:due_end]
+        self.active_notes.extend(new_notes)
+        for note in new_notes:
+            self._notes_by_pitch[note.note_number].append(note)
+        self._active_start = np.concatenate(
+            (self._active_start, self._note_table["onset"][start:due_end])
+        )
+        self._active_pitch = np.concatenate(
+            (self._active_pitch, self._note_table["pitch"][start:due_end])
+        )
+        self._active_y = np.concatenate((self._active_y, np.zeros(count)))
+        self._active_status = np.concatenate(
+            (self._active_status, np.zeros(count, np.uint8))
+        )
+        self._active_hit_time = np.concatenate(
+            (self._active_hit_time, np.zeros(count))
+        )
+        self._next_note_index = due_end
 
     def handle_note_played(self, note_number: int) -> bool:
         """
@@ -337,15 +578,41 @@ class NoteGenerator:
         Returns:
             True if the note was hit, False otherwise
         """
-        for note in self.active_notes:
-            hit_status, score = note.check_hit(note_number, self.current_time)
-            if hit_status:
-                return True
-        return False
+        # Notes only ever leave the falling state, so drop finished ones from the front
+        pending = self._notes_by_pitch.get(note_number)
+        while pending and pending[0].status is not NoteStatus.FALLING:
+            pending.popleft()
+
+        if pending:
+            note = pending.popleft()
+        else:
+            # No note of this pitch is falling: the earliest falling note is played wrong
+            if self._status_dirty:
+                self._sync_active_status()
+            falling = np.flatnonzero(self._active_status == NoteStatus.FALLING.value)
+            if not falling.size:
+                return False
+            note = self.active_notes[falling[0]]
+
+        hit_status, score = note.check_hit(note_number, self.current_time)
+        self._status_dirty = True
+
+        # Keep the running stats current so get_current_stats() is plain field reads
+        if hit_status == "wrong":
+            self.wrong_notes += 1
+        elif hit_status is not None:
+            self.hits += 1
+            if hit_status == "perfect":
+                self.perfect_hits += 1
+            elif hit_status == "good":
+                self.good_hits += 1
+            self.score += score
+            self.hit_notes.add(note_number)
+        return hit_status is not None
 
     def reset(self):
         """Reset the note generator to its initial state."""
-        self.active_notes = []
+        self._clear_active_notes()
         self.score = 0
         self.perfect_hits = 0
         self.good_hits = 0
@@ -359,17 +626,29 @@ class NoteGenerator:
         self.total_pause_time = 0
         self._parse_midi_data()  # Reload notes
 
-    def pause(self):
-        """Pause the note generator."""
+    def pause(self, now: Optional[float] = None):
+        """
+        Pause the note generator.
+
+        Args:
+            now: Current time.monotonic() timestamp, if the caller already has one
+        """
         if not self.paused:
             self.paused = True
-            self.pause_start_time = time.time()
+            self.pause_start_time = time.monotonic() if now is None else now
 
-    def resume(self):
-        """Resume the note generator."""
+    def resume(self, now: Optional[float] = None):
+        """
+        Resume the note generator.
+
+        Args:
+            now: Current time.monotonic() timestamp, if the caller already has one
+        """
         if self.paused:
             self.paused = False
-            pause_duration = time.time() - self.pause_start_time
+            if now is None:
+                now = time.monotonic()
+            pause_duration = now - self.pause_start_time
             self.total_pause_time += pause_duration
             self.start_time += pause_duration  # Adjust start time
 
@@ -380,7 +659,7 @@ class NoteGenerator:
         Returns:
             True if all notes have been processed, False otherwise
         """
-        return len(self.note_queue) == 0 and len(self.active_notes) == 0
+        return self._next_note_index >= len(self.note_queue) and len(self.active_notes) == 0
 
     def get_visible_notes(self) -> List[Note]:
         """
@@ -389,7 +668,13 @@ class NoteGenerator:
         Returns:
             List of visible notes
         """
-        return self.active_notes
+        # Copy the positions computed in update() onto the notes still falling
+        active = self.active_notes
+        falling = np.flatnonzero(self._active_status == NoteStatus.FALLING.value)
+        for i, y in zip(falling.tolist(), self._active_y[falling].tolist()):
+            note = active[i]
+            note.y_pos = note.y = y
+        return active
 
     def get_current_stats(self) -> Dict:
         """
@@ -398,6 +683,7 @@ class NoteGenerator:
         Returns:
             Dictionary containing statistics
         """
+        judged = self.hits + self.misses + self.wrong_notes
         return {
             "score": self.score,
             "perfect_hits": self.perfect_hits,
@@ -405,6 +691,9 @@ class NoteGenerator:
             "hits": self.hits,
             "misses": self.misses,
             "wrong_notes": self.wrong_notes,
-            "remaining_notes": len(self.note_queue) + len(self.active_notes),
+            "accuracy": self.hits / judged * 100 if judged else 0.0,
+            "remaining_notes": len(self.note_queue)
+            - self._next_note_index
+            + len(self.active_notes),
             "is_complete": self.is_complete(),
         }
@@ -1,29 +1,57 @@
 import time
 from typing import Dict, List, Optional, Tuple
 import pygame
+import heapq
 import json
 import os
+import threading
+
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
 
 class ScoreTracker:
     """
     Tracks and calculates scores for the learning mode.
     """
+    
+    # note_hit/note_missed run on every judged note, so keep attribute access on slots
+    __slots__ = (
+        "notes_hit",
+        "notes_missed",
+        "total_notes",
+        "_accuracy",
+        "combo",
+        "max_combo",
+        "last_hit_time",
+        "score",
+        "start_time",
+        "end_time",
+        "difficulty_multiplier",
+        "high_scores_file",
+        "high_scores",
+        "_save_thread",
+    )
+    
     def __init__(self):
         """Initialize the score tracker."""
         self.reset()
         self.high_scores_file = "scores.json"
         self.high_scores = self._load_high_scores()
+        self._save_thread: Optional[threading.Thread] = None
         
     def reset(self):
         """Reset all scores and statistics."""
         self.notes_hit = 0
         self.notes_missed = 0
         self.total_notes = 0
+        self._accuracy = 0.0
         self.combo = 0
         self.max_combo = 0
         self.last_hit_time = 0
         self.score = 0
-        self.start_time = time.time()
+        self.start_time = time.monotonic()
         self.end_time = None
         self.difficulty_multiplier = 1.0
         
@@ -37,6 +65,7 @@ class ScoreTracker:
         """
         self.notes_hit += 1
         self.total_notes += 1
+        self._accuracy = self.notes_hit / self.total_notes * 100
         self.combo += 1
         
         # Update max combo if current combo is larger
@@ -52,7 +81,7 @@ class ScoreTracker:
         
         # Add to total score
         self.score += points
-        self.last_hit_time = time.time()
+        self.last_hit_time = time.monotonic()
         
     def note_missed(self, note_number: int):
         """
@@ -63,6 +92,7 @@ class ScoreTracker:
         """
         self.notes_missed += 1
         self.total_notes += 1
+        self._accuracy = self.notes_hit / self.total_notes * 100
         self.combo = 0  # Reset combo on miss
         
     def set_difficulty(self, difficulty: str):
@@ -83,7 +113,7 @@ class ScoreTracker:
         
     def complete_session(self):
         """Mark the current session as complete and record the end time."""
-        self.end_time = time.time()
+        self.end_time = time.monotonic()
         self._check_high_score()
         
     def _check_high_score(self):
@@ -97,25 +127,24 @@ class ScoreTracker:
             self.high_scores[song_name] = []
             
         # Add current score to list
-        self.high_scores[song_name].append({
+        entry = {
             'score': self.score,
             'accuracy': self.get_accuracy(),
             'max_combo': self.max_combo,
             'date': time.strftime("%Y-%m-%d %H:%M:%S")
-        })
+        }
+        self.high_scores[song_name].append(entry)
         
-        # Sort scores for this song
-        self.high_scores[song_name] = sorted(
-            self.high_scores[song_name], 
-            key=lambda x: x['score'], 
-            reverse=True
+        # Keep only the top 10 scores for this song, best first
+        self.high_scores[song_name] = heapq.nlargest(
+            10,
+            self.high_scores[song_name],
+            key=lambda x: x['score']
         )
         
-        # Keep only top 10 scores
-        self.high_scores[song_name] = self.high_scores[song_name][:10]
-        
-        # Save high scores
-        self._save_high_scores()
+        # Only rewrite the file if the score made the list
+        if any(score is entry for score in self.high_scores[song_name]):
+            self._save_high_scores()
         
     def _load_high_scores(self) -> Dict:
         """
@@ -134,24 +163,42 @@ class ScoreTracker:
             return {}
             
     def _save_high_scores(self):
-        """Save high scores to file."""
+        """Save high scores to file on a background thread."""
+        # Serialize now so the writer doesn't race later changes to high_scores
+        if orjson is not None:
+            data = orjson.dumps(self.high_scores, option=orjson.OPT_INDENT_2)
+        else:
+            data = json.dumps(self.high_scores, indent=2).encode()
+        
+        # Let a previous save finish first so writes land in order
+        if self._save_thread is not None:
+            self._save_thread.join()
+        self._save_thread = threading.Thread(target=self._write_high_scores, args=(data,))
+        self._save_thread.start()
+        
+    def _write_high_scores(self, data: bytes):
+        """
+        Atomically replace the high score file.
+        
+        Args:
+            data: Serialized high scores
+        """
+        temp_file = self.high_scores_file + ".tmp"
         try:
-            with open(self.high_scores_file, 'w') as f:
-                json.dump(self.high_scores, f, indent=2)
+            with open(temp_file, 'wb') as f:
+                f.write(data)
+            os.replace(temp_file, self.high_scores_file)
         except IOError:
             print("Error: Could not save high scores.")
             
     def get_accuracy(self) -> float:
         """
-        Calculate the current accuracy.
+        Get the current accuracy, kept up to date by note_hit and note_missed.
         
         Returns:
             Accuracy as a percentage
         """
-        if self.total_notes == 0:
-            return 0.0
-            
-        return (self.notes_hit / self.total_notes) * 100
+        return self._accuracy
         
     def get_session_time(self) -> float:
         """
@@ -163,7 +210,7 @@ class ScoreTracker:
         if self.end_time is not None:
             return self.end_time - self.start_time
         else:
-            return time.time() - self.start_time
+            return time.monotonic() - self.start_time
             
     def get_performance_summary(self) -> Dict:
         """
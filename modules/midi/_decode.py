@@ -0,0 +1,81 @@
+"""
+MIDI Decoding Kernels
+
+This module classifies batches of raw MIDI status/data bytes into note-on,
+note-off and control-change events. When Numba is installed the decoder is
+JIT-compiled (and releases the GIL); otherwise an equivalent NumPy version is used.
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional
+    njit = None
+
+
+def _decode_midi_loop(status, data1, data2):
+    """
+    Classify MIDI events in a single pass.
+
+    Args:
+        status: uint8 array of status bytes
+        data1: uint8 array of first data bytes
+        data2: uint8 array of second data bytes
+
+    Returns:
+        Tuple of (note_on_idx, note_off_idx, cc_idx) index arrays
+    """
+    n = status.shape[0]
+    note_on_idx = np.empty(n, np.int64)
+    note_off_idx = np.empty(n, np.int64)
+    cc_idx = np.empty(n, np.int64)
+    n_on = 0
+    n_off = 0
+    n_cc = 0
+
+    for i in range(n):
+        command = status[i] & 0xF0
+        if command == 0x90 and data2[i] > 0:
+            note_on_idx[n_on] = i
+            n_on += 1
+        elif command == 0x80 or command == 0x90:
+            # 0x9n with velocity 0 is a note off as well
+            note_off_idx[n_off] = i
+            n_off += 1
+        elif command == 0xB0:
+            cc_idx[n_cc] = i
+            n_cc += 1
+
+    return note_on_idx[:n_on], note_off_idx[:n_off], cc_idx[:n_cc]
+
+
+def _decode_midi_numpy(status, data1, data2):
+    """
+    Classify MIDI events with vectorized masks (fallback without Numba).
+
+    Args:
+        status: uint8 array of status bytes
+        data1: uint8 array of first data bytes
+        data2: uint8 array of second data bytes
+
+    Returns:
+        Tuple of (note_on_idx, note_off_idx, cc_idx) index arrays
+    """
+    command = status & 0xF0
+    note_on_mask = (command == 0x90) & (data2 > 0)
+    note_off_mask = (command == 0x80) | ((command == 0x90) & (data2 == 0))
+    cc_mask = command == 0xB0
+    return np.flatnonzero(note_on_mask), np.flatnonzero(note_off_mask), np.flatnonzero(cc_mask)
+
+
+if njit is not None:
+    decode_midi = njit(cache=True, nogil=True)(_decode_midi_loop)
+else:
+    decode_midi = _decode_midi_numpy
+
+
+def warmup():
+    """Run the decoder once so JIT compilation doesn't happen on the first MIDI batch."""
+    empty = np.zeros(0, np.uint8)
+    decode_midi(empty, empty, empty)
@@ -7,6 +7,14 @@ import time
 from modules.core.app_state import AppState
 
 
+# Maximum number of events fetched from PortMidi per read() call (PortMidi's default buffer size)
+MIDI_READ_BATCH = 1024
+
+# Sleep between polls of an idle device, doubled on every empty poll up to the maximum
+MIDI_IDLE_SLEEP_MIN = 0.001
+MIDI_IDLE_SLEEP_MAX = 0.008
+
+
 class MIDIInput:
     """
     Class for handling MIDI input devices.
@@ -34,6 +42,13 @@ class MIDIInput:
         
         # Set to track currently pressed keys
         self.active_notes: Set[int] = set()
+        
+        # Handlers for raw MIDI messages, keyed by message type (status high nibble)
+        self._dispatch: Dict[int, Callable[[int, int], None]] = {
+            0x90: self._dispatch_note_on,
+            0x80: self._dispatch_note_off,
+            0xB0: self._dispatch_control_change,
+        }
     
     def get_available_input_devices(self) -> List[Tuple[int, str]]:
         """
@@ -57,12 +72,14 @@ class MIDIInput:
                 
         return devices
     
-    def connect_to_device(self, device_id: int = None) -> bool:
+    def connect_to_device(self, device_id: int = None, listen: bool = True) -> bool:
         """
         Connect to a specific MIDI input device or the default one.
         
         Args:
             device_id: ID of the device to connect to, or None for default
+            listen: Start the listening thread; pass False when the caller reads
+                    the device itself through get_events()
             
         Returns:
             True if connected successfully, False otherwise
@@ -102,7 +119,8 @@ class MIDIInput:
             print(f"Connected to MIDI input: {self.connected_device_name}")
             
             # Start the listening thread
-            self.start_listening()
+            if listen:
+                self.start_listening()
             return True
             
         except pygame.midi.MidiException as e:
@@ -154,15 +172,25 @@ class MIDIInput:
             return
             
         # Main listening loop
+        idle_sleep = MIDI_IDLE_SLEEP_MIN
         while self.is_listening:
             if self.input_device.poll():
-                # Read all available MIDI events (max 10 at a time to prevent blocking)
-                events = self.input_device.read(10)
-                for event in events:
-                    self._process_midi_event(event)
-                    
-            # Small sleep to prevent CPU hogging
-            time.sleep(0.001)
+                # Read the pending MIDI events in batches until a short read empties the queue
+                events = self.input_device.read(MIDI_READ_BATCH)
+                while events:
+                    for event in events:
+                        self._process_midi_event(event)
+                    if len(events) < MIDI_READ_BATCH:
+                        break
+                    events = self.input_device.read(MIDI_READ_BATCH)
+                
+                # More events usually follow while playing, so poll again right away
+                idle_sleep = MIDI_IDLE_SLEEP_MIN
+                continue
+            
+            # Back off while the device is quiet to prevent CPU hogging
+            time.sleep(idle_sleep)
+            idle_sleep = min(idle_sleep * 2, MIDI_IDLE_SLEEP_MAX)
     
     def _process_midi_event(self, event):
         """
@@ -173,37 +201,47 @@ class MIDIInput:
         """
         # Extract event data
         # Pygame MIDI event format: [[status, data1, data2, data3], timestamp]
-        midi_data = event[0]
-        status = midi_data[0]
+        status, data1, data2, _ = event[0]
         
-        # Extract the message type (high nibble) and channel (low nibble)
-        message_type = status & 0xF0
-        channel = status & 0x0F
+        # Message type is the high nibble; the channel (low nibble) is not used
+        handler = self._dispatch.get(status & 0xF0)
+        if handler is not None:
+            handler(data1, data2)
+    
+    def _dispatch_note_on(self, note: int, velocity: int):
+        """
+        Dispatch a raw Note On message (0x90-0x9F).
         
-        # Note On event (0x90-0x9F)
-        if message_type == 0x90:
-            note = midi_data[1]
-            velocity = midi_data[2]
-            
-            # Some devices send Note On with velocity 0 instead of Note Off
-            if velocity > 0:
-                self._handle_note_on(note, velocity)
-                self.active_notes.add(note)
-            else:
-                self._handle_note_off(note) 
-                self.active_notes.discard(note)
-                
-        # Note Off event (0x80-0x8F)
-        elif message_type == 0x80:
-            note = midi_data[1]
-            self._handle_note_off(note)
-            self.active_notes.discard(note)
-            
-        # Control Change (0xB0-0xBF)
-        elif message_type == 0xB0:
-            control = midi_data[1]
-            value = midi_data[2]
-            self._handle_control_change(control, value)
+        Args:
+            note: MIDI note number (0-127)
+            velocity: Note velocity (0-127); some devices send 0 instead of a Note Off
+        """
+        if velocity > 0:
+            self._handle_note_on(note, velocity)
+            self.active_notes.add(note)
+        else:
+            self._dispatch_note_off(note, velocity)
+    
+    def _dispatch_note_off(self, note: int, velocity: int):
+        """
+        Dispatch a raw Note Off message (0x80-0x8F).
+        
+        Args:
+            note: MIDI note number (0-127)
+            velocity: Release velocity (unused)
+        """
+        self._handle_note_off(note)
+        self.active_notes.discard(note)
+    
+    def _dispatch_control_change(self, control: int, value: int):
+        """
+        Dispatch a raw Control Change message (0xB0-0xBF).
+        
+        Args:
+            control: Controller number (0-127)
+            value: Controller value (0-127)
+        """
+        self._handle_control_change(control, value)
     
     def _handle_note_on(self, note: int, velocity: int):
         """
@@ -261,6 +299,30 @@ class MIDIInput:
         if self.on_control_change:
             self.on_control_change(control, value)
     
+    def get_events(self) -> List[List]:
+        """
+        Read all pending MIDI events from the input device.
+        
+        Only for devices connected with listen=False: the listening thread would
+        otherwise take some of the events and handle them itself.
+        
+        Returns:
+            List of [[status, data1, data2, data3], timestamp] events, empty if none are pending
+        """
+        if self.is_listening:
+            raise RuntimeError("MIDI input is read by the listening thread; connect with listen=False to use get_events()")
+        if self.input_device is None or not self.input_device.poll():
+            return []
+        events = self.input_device.read(MIDI_READ_BATCH)
+        
+        # A full batch means more may be waiting in PortMidi's buffer
+        if len(events) == MIDI_READ_BATCH:
+            batch = events
+            while len(batch) == MIDI_READ_BATCH:
+                batch = self.input_device.read(MIDI_READ_BATCH)
+                events.extend(batch)
+        return events
+    
     def get_active_notes(self) -> Set[int]:
         """
         Get the set of currently active (pressed) MIDI notes.
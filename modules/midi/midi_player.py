@@ -1,16 +1,32 @@
-import pygame
-import pygame.midi
-import mido
-from typing import List, Dict, Optional, Tuple, Callable
+import gc
+import heapq
+from typing import TYPE_CHECKING, List, Dict, Optional, Tuple, Callable
 import threading
 import time
 import os
 from dataclasses import dataclass
 
+import numpy as np
+
 from modules.core.app_state import AppState
 
+# pygame and mido are imported where first needed so importing this module stays cheap
+if TYPE_CHECKING:
+    import mido
+    import pygame.midi
+
+
+# Maximum number of events pygame.midi.Output.write() accepts per call
+MIDI_WRITE_BATCH = 1024
+
+# Control change 123 (All Notes Off) for each of the 16 MIDI channels
+ALL_NOTES_OFF_MESSAGES = [[0xB0 | channel, 123, 0] for channel in range(16)]
 
-@dataclass
+# Win32 SetThreadPriority level used for the playback thread
+THREAD_PRIORITY_TIME_CRITICAL = 15
+
+
+@dataclass(slots=True)
 class MidiNote:
     """Represents a MIDI note from a MIDI file."""
     note: int
@@ -18,7 +34,6 @@ class MidiNote:
     start_time: float
     end_time: float
     channel: int
-    is_playing: bool = False
     
     @property
     def duration(self) -> float:
@@ -40,14 +55,19 @@ class MIDIPlayer:
             app_state: The application state object
         """
         self.app_state = app_state
-        self.midi_file: Optional[mido.MidiFile] = None
+        self.midi_file: Optional["mido.MidiFile"] = None
         self.notes: List[MidiNote] = []
-        self.notes_by_start_time: Dict[float, List[MidiNote]] = {}
+        # The same notes as parallel arrays sorted by start time, used by playback
+        self._set_note_arrays()
+        # Min-heap of (end_time, note index) for notes the playback thread still has to stop
+        self._pending_offs: List[Tuple[int, int]] = []  # (end time in microseconds, note index)
+        # Set to wake the playback thread early when playback state changes
+        self._wake = threading.Event()
         self.playback_thread: Optional[threading.Thread] = None
         self.is_playing = False
         self.current_position = 0.0  # Position in seconds
         self.playback_speed = 1.0
-        self.output_device: Optional[pygame.midi.Output] = None
+        self.output_device: Optional["pygame.midi.Output"] = None
         self.on_note_on: Optional[Callable[[int, int], None]] = None
         self.on_note_off: Optional[Callable[[int], None]] = None
         
@@ -56,6 +76,8 @@ class MIDIPlayer:
     
     def _init_midi_output(self):
         """Initialize MIDI output device."""
+        import pygame.midi
+        
         if pygame.midi.get_init():
             try:
                 default_output_id = pygame.midi.get_default_output_id()
@@ -83,9 +105,9 @@ class MIDIPlayer:
         
         try:
             # Load the MIDI file
+            import mido
             self.midi_file = mido.MidiFile(filepath)
             self.notes = []
-            self.notes_by_start_time = {}
             
             # Parse the file and extract notes
             self._parse_midi_file()
@@ -108,60 +130,121 @@ class MIDIPlayer:
         if not self.midi_file:
             return
         
-        tempo = 500000  # Default tempo (microseconds per beat)
-        current_time = 0.0  # Time in seconds
-        active_notes = {}  # Dict to track note on events {(note, channel): start_time}
+        # Absolute tick of every message, per track
+        track_ticks = [
+            np.cumsum(np.fromiter((msg.time for msg in track), np.int64, len(track)))
+            for track in self.midi_file.tracks
+        ]
         
-        # Process all events in all tracks
-        for track in self.midi_file.tracks:
-            track_time = 0.0
-            
-            for msg in track:
-                # Convert delta time to seconds
-                delta_seconds = mido.tick2second(msg.time, self.midi_file.ticks_per_beat, tempo)
-                track_time += delta_seconds
-                
-                # Set tempo if tempo event
-                if msg.type == 'set_tempo':
-                    tempo = msg.tempo
-                
+        # First pass: collect tempo changes, which can live in any track (usually a separate
+        # meta track) but apply to all, and count sounding note-ons to size the note storage
+        tempo_changes = []
+        max_notes = 0
+        for track, ticks in zip(self.midi_file.tracks, track_ticks):
+            for msg, tick in zip(track, ticks.tolist()):
+                if msg.type == 'note_on':
+                    if msg.velocity > 0:
+                        max_notes += 1
+                elif msg.type == 'set_tempo':
+                    tempo_changes.append((tick, msg.tempo))
+        tempo_changes.sort(key=lambda change: change[0])
+        tempo_map = self._build_tempo_map(tempo_changes, self.midi_file.ticks_per_beat)
+        
+        active_notes = {}  # Dict to track note on events {(note, channel): (start_tick, start_time)}
+        
+        # Preallocated note storage; unmatched note-ons leave unused slots at the end
+        notes = [None] * max_notes
+        start_ticks = [0] * max_notes  # Absolute start tick of each note
+        count = 0
+        
+        # Second pass: process all events in all tracks
+        for track, ticks in zip(self.midi_file.tracks, track_ticks):
+            track_times = self._ticks_to_seconds(ticks, tempo_map).tolist()
+            for msg, tick, track_time in zip(track, ticks.tolist(), track_times):
                 # Handle note on events
-                elif msg.type == 'note_on' and msg.velocity > 0:
-                    note_key = (msg.note, msg.channel)
-                    active_notes[note_key] = track_time
+                if msg.type == 'note_on' and msg.velocity > 0:
+                    active_notes[(msg.note, msg.channel)] = (tick, track_time)
                 
                 # Handle note off events
                 elif (msg.type == 'note_off') or (msg.type == 'note_on' and msg.velocity == 0):
-                    note_key = (msg.note, msg.channel)
+                    started = active_notes.pop((msg.note, msg.channel), None)
                     
-                    if note_key in active_notes:
-                        start_time = active_notes[note_key]
-                        end_time = track_time
+                    if started is not None:
+                        start_tick, start_time = started
                         
-                        note = MidiNote(
+                        notes[count] = MidiNote(
                             note=msg.note,
                             velocity=127,  # Use max velocity for note-off events
                             start_time=start_time,
-                            end_time=end_time,
+                            end_time=track_time,
                             channel=msg.channel
                         )
-                        
-                        # Add to notes list
-                        self.notes.append(note)
-                        
-                        # Group by start time for efficient playback
-                        if start_time not in self.notes_by_start_time:
-                            self.notes_by_start_time[start_time] = []
-                        self.notes_by_start_time[start_time].append(note)
-                        
-                        # Remove from active notes
-                        del active_notes[note_key]
+                        start_ticks[count] = start_tick
+                        count += 1
+        
+        # Seconds are monotonic in ticks, so sorting on the exact integer ticks gives the
+        # same (stable) start-time order and keeps notes struck together adjacent
+        order = np.argsort(np.array(start_ticks[:count], np.int64), kind='stable')
+        self.notes = [notes[i] for i in order.tolist()]
+        self._set_note_arrays()
+    
+    def _set_note_arrays(self):
+        """Rebuild the per-note arrays and the cached durations from self.notes."""
+        count = len(self.notes)
+        self._pitch = np.fromiter((note.note for note in self.notes), np.uint8, count)
+        self._velocity = np.fromiter((note.velocity for note in self.notes), np.uint8, count)
+        self._start = np.fromiter((note.start_time for note in self.notes), np.float64, count)
+        self._end = np.fromiter((note.end_time for note in self.notes), np.float64, count)
+        self._channel = np.fromiter((note.channel for note in self.notes), np.uint8, count)
+        self._playing = np.zeros(count, np.bool_)
+        self._duration = float(self._end.max()) if count else 0.0
+        # Longest single note, which bounds how far back get_notes_at() has to look
+        self._max_note_length = float((self._end - self._start).max()) if count else 0.0
+    
+    @staticmethod
+    def _build_tempo_map(tempo_changes: List[Tuple[int, int]],
+                         ticks_per_beat: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Build a piecewise-linear tick to seconds mapping from a file's tempo changes.
+        
+        Args:
+            tempo_changes: (absolute_tick, microseconds_per_beat) pairs sorted by tick
+            ticks_per_beat: Ticks per beat of the MIDI file
+            
+        Returns:
+            Tuple of (segment_ticks, segment_seconds, seconds_per_tick) arrays, one entry
+            per tempo segment starting with the default 120 BPM segment at tick 0
+        """
+        segment_ticks = np.array([0] + [tick for tick, _ in tempo_changes], np.int64)
+        tempos = np.array([500000] + [tempo for _, tempo in tempo_changes], np.float64)
+        seconds_per_tick = tempos / (1e6 * ticks_per_beat)
+        
+        # Time at which each segment starts
+        segment_seconds = np.zeros(len(segment_ticks))
+        np.cumsum(np.diff(segment_ticks) * seconds_per_tick[:-1], out=segment_seconds[1:])
+        return segment_ticks, segment_seconds, seconds_per_tick
+    
+    @staticmethod
+    def _ticks_to_seconds(ticks: np.ndarray,
+                          tempo_map: Tuple[np.ndarray, np.ndarray, np.ndarray]) -> np.ndarray:
+        """
+        Convert absolute ticks to seconds with a tempo map.
+        
+        Args:
+            ticks: Absolute tick positions
+            tempo_map: Tempo map from _build_tempo_map
+            
+        Returns:
+            Positions in seconds
+        """
+        segment_ticks, segment_seconds, seconds_per_tick = tempo_map
+        # With several changes on one tick, the last one wins
+        segment = np.searchsorted(segment_ticks, ticks, side='right') - 1
+        return segment_seconds[segment] + (ticks - segment_ticks[segment]) * seconds_per_tick[segment]
     
     def get_duration(self) -> float:
         """Get the total duration of the MIDI file in seconds."""
-        if not self.notes:
-            return 0.0
-        return max(note.end_time for note in self.notes)
+        return self._duration
     
     def play(self, from_position: float = None):
         """
@@ -176,6 +259,10 @@ class MIDIPlayer:
         if from_position is not None:
             self.current_position = max(0.0, min(from_position, self.get_duration()))
         
+        # A paused loop may still be releasing its notes; let it finish first
+        if self.playback_thread is not None:
+            self.playback_thread.join()
+        
         self.is_playing = True
         self.playback_thread = threading.Thread(target=self._playback_thread_func)
         self.playback_thread.daemon = True
@@ -187,11 +274,13 @@ class MIDIPlayer:
         """Pause the MIDI playback."""
         if self.is_playing:
             self.is_playing = False
+            self._wake.set()
             print("Playback paused")
     
     def stop(self):
         """Stop the MIDI playback and reset position."""
         self.is_playing = False
+        self._wake.set()
         self.current_position = 0.0
         
         # Turn off any playing notes
@@ -206,109 +295,175 @@ class MIDIPlayer:
             speed: Playback speed multiplier (1.0 = normal speed)
         """
         self.playback_speed = max(0.1, min(speed, 2.0))
+        self._wake.set()
         print(f"Playback speed set to {self.playback_speed:.1f}x")
     
     def _playback_thread_func(self):
         """Thread function for MIDI playback."""
+        self._set_thread_priority()
+        
+        # Keep garbage collection pauses out of note timing while playing
+        gc_was_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self._playback_loop()
+        finally:
+            if gc_was_enabled:
+                gc.enable()
+    
+    @staticmethod
+    def _set_thread_priority():
+        """Raise the calling thread's scheduling priority, if the OS allows it."""
+        try:
+            if os.name == 'nt':
+                import ctypes
+                kernel32 = ctypes.windll.kernel32
+                kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_TIME_CRITICAL)
+            else:
+                # On Linux pid 0 targets the calling thread; needs CAP_SYS_NICE or an rtprio limit
+                priority = os.sched_get_priority_max(os.SCHED_FIFO) // 2
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+        except (AttributeError, OSError):
+            # Not supported (e.g. macOS) or not permitted: keep the normal priority
+            pass
+    
+    def _playback_loop(self):
+        """Play notes from current_position until the song ends or playback stops."""
         if not self.notes:
             self.is_playing = False
             return
             
-        # Get a sorted list of all start times for efficient iteration
-        start_times = sorted(self.notes_by_start_time.keys())
+        # Plain lists of the note columns for fast scalar access in the loop.
+        # The loop clock runs on integer microseconds, so times are converted once here.
+        start_us = np.round(self._start * 1e6).astype(np.int64)
+        start_times = start_us.tolist()
+        end_times = np.round(self._end * 1e6).astype(np.int64).tolist()
+        duration_us = round(self._duration * 1e6)
+        pitches = self._pitch.tolist()
+        velocities = self._velocity.tolist()
+        channels = self._channel.tolist()
+        playing = self._playing
         
-        # Find the first start time that's >= current_position
-        start_idx = 0
-        while start_idx < len(start_times) and start_times[start_idx] < self.current_position:
-            start_idx += 1
+        # Find the first note starting at or after current_position
+        position_us = round(self.current_position * 1e6)
+        start_idx = int(np.searchsorted(start_us, position_us))
             
         # Reset all notes' playing status
-        for note in self.notes:
-            note.is_playing = False
+        playing[:] = False
             
+        # Note offs are delivered by this loop in end-time order
+        pending_offs = self._pending_offs = []
+        
         # Get the start time for the loop
-        start_time = time.time()
-        adjusted_position = self.current_position
+        start_ns = time.monotonic_ns()
+        adjusted_us = position_us
         
-        # Main playback loop
-        while self.is_playing and start_idx < len(start_times):
-            current_time = time.time()
-            elapsed = (current_time - start_time) * self.playback_speed
-            self.current_position = adjusted_position + elapsed
+        # Main playback loop, running until the last note has started and ended
+        wake = self._wake
+        notes_on = self._notes_on
+        notes_off = self._notes_off
+        while self.is_playing and (start_idx < len(start_times) or pending_offs):
+            wake.clear()
+            # Speed in thousandths keeps the clock in exact integer arithmetic
+            speed_milli = round(self.playback_speed * 1000)
+            position_us = adjusted_us + (time.monotonic_ns() - start_ns) * speed_milli // 1_000_000
+            self.current_position = position_us / 1e6
+            
+            # Stop the notes whose end time has been reached
+            stopped = []
+            while pending_offs and pending_offs[0][0] <= position_us:
+                _, index = heapq.heappop(pending_offs)
+                stopped.append((pitches[index], channels[index]))
+                playing[index] = False
+            if stopped:
+                notes_off(stopped)
             
             # Process all notes that should start by current_position
-            while start_idx < len(start_times) and start_times[start_idx] <= self.current_position:
-                time_point = start_times[start_idx]
-                for note in self.notes_by_start_time[time_point]:
-                    # Start the note
-                    self._note_on(note.note, note.velocity, note.channel)
-                    note.is_playing = True
-                    
-                    # Schedule note off based on duration
-                    off_time = note.end_time - self.current_position
-                    if off_time > 0:
-                        threading.Timer(off_time / self.playback_speed, 
-                                       self._note_off, args=[note.note, note.channel]).start()
+            started = []
+            while start_idx < len(start_times) and start_times[start_idx] <= position_us:
+                started.append((pitches[start_idx], velocities[start_idx], channels[start_idx]))
+                playing[start_idx] = True
+                
+                # Schedule note off based on duration
+                heapq.heappush(pending_offs, (end_times[start_idx], start_idx))
                 start_idx += 1
+            if started:
+                notes_on(started)
                 
             # Check if we've reached the end
             if start_idx >= len(start_times):
                 # Check for any remaining notes to finish
-                latest_end = max(note.end_time for note in self.notes)
-                if self.current_position >= latest_end:
+                if position_us >= duration_us:
                     self.is_playing = False
                     self.current_position = 0.0
                     print("Playback finished")
-                
-            time.sleep(0.001)  # Small sleep to prevent CPU hogging
+                    break
+            
+            # Sleep until the next note starts or ends, or until pause/stop/speed changes wake us
+            next_time = min(
+                start_times[start_idx] if start_idx < len(start_times) else duration_us,
+                pending_offs[0][0] if pending_offs else duration_us,
+            )
+            wake.wait(max(0, next_time - position_us) / (speed_milli * 1000))
+        
+        # Paused or stopped: release the notes that are still sounding
+        if pending_offs:
+            self._notes_off([(pitches[index], channels[index]) for _, index in pending_offs])
+            playing[:] = False
+            pending_offs.clear()
             
-    def _note_on(self, note: int, velocity: int, channel: int):
+    def _notes_on(self, notes: List[Tuple[int, int, int]]):
         """
-        Send note-on MIDI message.
+        Send note-on MIDI messages for notes that start together, in one write.
         
         Args:
-            note: MIDI note number (0-127)
-            velocity: Note velocity (0-127)
-            channel: MIDI channel (0-15)
+            notes: (note, velocity, channel) tuples with note/velocity 0-127 and channel 0-15
         """
-        if self.output_device:
-            try:
-                self.output_device.note_on(note, velocity, channel)
-            except Exception as e:
-                print(f"Error sending note-on: {e}")
+        if self.output_device is not None:
+            self._write_messages([[0x90 | channel, note, velocity] for note, velocity, channel in notes],
+                                 "note-on")
                 
         # Call the note_on callback if registered
         if self.on_note_on:
-            self.on_note_on(note, velocity)
+            for note, velocity, _ in notes:
+                self.on_note_on(note, velocity)
     
-    def _note_off(self, note: int, channel: int):
+    def _notes_off(self, notes: List[Tuple[int, int]]):
         """
-        Send note-off MIDI message.
+        Send note-off MIDI messages for notes that end together, in one write.
         
         Args:
-            note: MIDI note number (0-127)
-            channel: MIDI channel (0-15)
+            notes: (note, channel) tuples with note 0-127 and channel 0-15
         """
-        if self.output_device:
-            try:
-                self.output_device.note_off(note, 0, channel)
-            except Exception as e:
-                print(f"Error sending note-off: {e}")
+        if self.output_device is not None:
+            self._write_messages([[0x80 | channel, note, 0] for note, channel in notes], "note-off")
                 
         # Call the note_off callback if registered
         if self.on_note_off:
-            self.on_note_off(note)
+            for note, _ in notes:
+                self.on_note_off(note)
+    
+    def _write_messages(self, messages: List[List[int]], kind: str):
+        """
+        Write short MIDI messages to the output device with as few calls as possible.
+        
+        Args:
+            messages: [status, data1, data2] messages
+            kind: Message kind for the error report
+        """
+        if self.output_device is None:
+            return
+        write = self.output_device.write
+        try:
+            # Output.write() takes at most MIDI_WRITE_BATCH events per call
+            for i in range(0, len(messages), MIDI_WRITE_BATCH):
+                write([[message, 0] for message in messages[i:i + MIDI_WRITE_BATCH]])
+        except Exception as e:
+            print(f"Error sending {kind}: {e}")
     
     def _all_notes_off(self):
         """Turn off all MIDI notes on all channels."""
-        if self.output_device:
-            # Send all notes off on all 16 channels
-            for channel in range(16):
-                try:
-                    # Controller 123 = All Notes Off
-                    self.output_device.write_short(0xB0 + channel, 123, 0)
-                except Exception as e:
-                    print(f"Error sending all-notes-off: {e}")
+        self._write_messages(ALL_NOTES_OFF_MESSAGES, "all-notes-off")
     
     def register_note_callbacks(self, 
                                 on_note_on: Callable[[int, int], None], 
@@ -325,16 +480,32 @@ class MIDIPlayer:
     
     def get_active_notes(self) -> List[int]:
         """Get a list of currently active (playing) notes."""
-        return [note.note for note in self.notes if note.is_playing]
+        return self._pitch[self._playing].tolist()
+    
+    def get_notes_at(self, time_seconds: float) -> List[MidiNote]:
+        """
+        Get the notes of the loaded file that are sounding at a given time.
+        
+        Args:
+            time_seconds: Position in the file in seconds
+            
+        Returns:
+            Notes with start_time <= time_seconds < end_time, in start-time order
+        """
+        # Only notes starting within one maximum note length before the time can still sound
+        first = int(np.searchsorted(self._start, time_seconds - self._max_note_length, side='left'))
+        last = int(np.searchsorted(self._start, time_seconds, side='right'))
+        sounding = np.flatnonzero(self._end[first:last] > time_seconds) + first
+        return [self.notes[i] for i in sounding.tolist()]
     
     def cleanup(self):
         """Clean up resources."""
         self.is_playing = False
-        if self.playback_thread and self.playback_thread.is_alive():
+        if self.playback_thread is not None and self.playback_thread.is_alive():
             self.playback_thread.join(timeout=1.0)
             
         self._all_notes_off()
         
-        if self.output_device:
+        if self.output_device is not None:
             self.output_device.close()
             self.output_device = None
@@ -5,12 +5,23 @@ This module handles loading, saving, and accessing application settings and conf
 It provides a centralized way to manage user preferences and application settings.
 """
 
+import atexit
 import os
 import json
 import logging
+import threading
 from typing import Dict, Any, Optional, Union
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:  # orjson is optional
+    orjson = None
+
+
+# Marks a key path that is not in the lookup cache
+_MISSING = object()
+
 
 class Config:
     """
@@ -99,8 +110,20 @@ class Config:
         self.app_dir = self._get_app_directory()
         self.config_file = config_file or os.path.join(self.app_dir, "config.json")
         
-        # Initialize configuration with defaults
-        self.config = self.DEFAULT_CONFIG.copy()
+        # Initialize configuration with a deep copy of the defaults
+        self.config = json.loads(_DEFAULT_CONFIG_JSON)
+        
+        # Values already resolved by get(), keyed by dot-separated path.
+        # Cleared whenever the configuration changes.
+        self._flat: Dict[str, Any] = {}
+        
+        # Deferred saves: changes mark the config dirty and a timer (or exit) writes it once
+        self._dirty = False
+        self._save_timer: Optional[threading.Timer] = None
+        self._save_lock = threading.Lock()
+        # Hash of the bytes last written, so unchanged configs are not rewritten
+        self._saved_hash: Optional[int] = None
+        atexit.register(self.flush)
         
         # Load configuration if it exists
         if os.path.exists(self.config_file):
@@ -143,11 +166,13 @@ class Config:
             json.JSONDecodeError: If the configuration file contains invalid JSON
         """
         self.logger.info("Loading configuration from %s", self.config_file)
-        with open(self.config_file, "r") as f:
-            loaded_config = json.load(f)
+        with open(self.config_file, "rb") as f:
+            data = f.read()
+        loaded_config = orjson.loads(data) if orjson is not None else json.loads(data)
             
         # Merge loaded config with defaults to ensure all keys exist
         self._merge_configs(self.config, loaded_config)
+        self._flat.clear()
         
     def _merge_configs(self, target: Dict[str, Any], source: Dict[str, Any]) -> None:
         """
@@ -175,12 +200,48 @@ class Config:
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(self.config_file), exist_ok=True)
             
-            with open(self.config_file, "w") as f:
-                json.dump(self.config, f, indent=4)
+            # Compact output unless debugging, when a readable file is more useful
+            debug = self.get("app.log_level") == "DEBUG"
+            if orjson is not None:
+                data = orjson.dumps(self.config, option=orjson.OPT_INDENT_2 if debug else 0)
+            elif debug:
+                data = json.dumps(self.config, indent=2).encode("utf-8")
+            else:
+                data = json.dumps(self.config, separators=(",", ":")).encode("utf-8")
+            
+            data_hash = hash(data)
+            if data_hash != self._saved_hash:
+                # Write to a temporary file and swap it in so a crash can't leave a torn file
+                tmp_file = self.config_file + ".tmp"
+                with open(tmp_file, "wb") as f:
+                    f.write(data)
+                os.replace(tmp_file, self.config_file)
+                self._saved_hash = data_hash
+            self._dirty = False
         except Exception as e:
             self.logger.error("Failed to save configuration: %s", str(e))
             raise
     
+    def _mark_dirty(self) -> None:
+        """Schedule a save, coalescing every change made before it runs."""
+        with self._save_lock:
+            self._dirty = True
+            if self._save_timer is None and self.get("files.auto_save", True):
+                self._save_timer = threading.Timer(
+                    self.get("files.auto_save_interval", 300), self.flush
+                )
+                self._save_timer.daemon = True
+                self._save_timer.start()
+    
+    def flush(self) -> None:
+        """Write pending configuration changes to file now, if there are any."""
+        with self._save_lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save_timer = None
+            if self._dirty:
+                self.save()
+    
     def get(self, key_path: str, default: Any = None) -> Any:
         """
         Get a configuration value.
@@ -192,6 +253,10 @@ class Config:
         Returns:
             Configuration value or default if not found
         """
+        value = self._flat.get(key_path, _MISSING)
+        if value is not _MISSING:
+            return value
+        
         keys = key_path.split(".")
         value = self.config
         
@@ -200,7 +265,8 @@ class Config:
                 value = value[key]
             else:
                 return default
-                
+        
+        self._flat[key_path] = value
         return value
     
     def set(self, key_path: str, value: Any) -> None:
@@ -225,6 +291,7 @@ class Config:
             
         # Set the value
         config_section[keys[-1]] = value
+        self._flat.clear()
         
     def get_section(self, section: str) -> Dict[str, Any]:
         """
@@ -240,7 +307,8 @@ class Config:
     
     def reset_to_defaults(self) -> None:
         """Reset all configuration values to their defaults."""
-        self.config = self.DEFAULT_CONFIG.copy()
+        self.config = json.loads(_DEFAULT_CONFIG_JSON)
+        self._flat.clear()
         self.save()
         self.logger.info("Configuration reset to defaults")
     
@@ -269,5 +337,8 @@ class Config:
             recent_files = recent_files[:max_recent]
             
         self.set("files.recent_files", recent_files)
-        self.save()
+        self._mark_dirty()
+
 
+# Serialized defaults; decoding this gives a fresh deep copy that shares nothing with DEFAULT_CONFIG
+_DEFAULT_CONFIG_JSON = json.dumps(Config.DEFAULT_CONFIG)
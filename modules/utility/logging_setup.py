@@ -0,0 +1,48 @@
+"""
+Logging Setup Module
+
+This module configures application-wide logging. Log records are handed to a
+background thread through a queue, so logging calls made from the render loop
+never wait on terminal or file I/O.
+"""
+
+import logging
+import logging.handlers
+import queue
+from typing import Optional, Union
+
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def setup_logging(level: Union[int, str] = logging.INFO,
+                  log_file: Optional[str] = None) -> logging.handlers.QueueListener:
+    """
+    Configure the root logger to write through a queue to the console and an optional log file.
+    
+    Args:
+        level: Logging level for the root logger (e.g. logging.INFO or "DEBUG")
+        log_file: Optional path of a file to also write log records to
+        
+    Returns:
+        The started QueueListener; call its stop() method on shutdown to flush pending records
+    """
+    formatter = logging.Formatter(LOG_FORMAT)
+    
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+    
+    log_queue: queue.Queue = queue.Queue(-1)
+    
+    root = logging.getLogger()
+    root.setLevel(level)
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(logging.handlers.QueueHandler(log_queue))
+    
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
@@ -6,8 +6,11 @@ scale and chord generation, and chord progression analysis.
 """
 
 from enum import Enum
+from functools import lru_cache
 from typing import List, Dict, Tuple, Optional, Union
 
+import numpy as np
+
 
 # Define constants for notes
 NOTES = ['C', 'C#', 'D', 'D#', 'E', 'F', 'F#', 'G', 'G#', 'A', 'A#', 'B']
@@ -15,6 +18,32 @@ FLAT_NOTES = ['C', 'Db', 'D', 'Eb', 'E', 'F', 'Gb', 'G', 'Ab', 'A', 'Bb', 'B']
 NOTE_TO_NUMBER = {note: i for i, note in enumerate(NOTES)}
 FLAT_NOTE_TO_NUMBER = {note: i for i, note in enumerate(FLAT_NOTES)}
 
+# Any accepted note name (sharp or flat) to its index and to its sharp spelling
+NAME_TO_IDX = {**NOTE_TO_NUMBER, **FLAT_NOTE_TO_NUMBER}
+NAME_TO_SHARP = {name: NOTES[idx] for name, idx in NAME_TO_IDX.items()}
+
+# The same for note names with an optional single-digit octave (e.g. 'Db', 'Db4'),
+# so per-note lookups need no octave stripping
+NOTE_TO_PITCH_CLASS = {
+    **NAME_TO_IDX,
+    **{f"{name}{octave}": idx for name, idx in NAME_TO_IDX.items() for octave in range(10)},
+}
+NOTE_TO_SHARP = {
+    **NAME_TO_SHARP,
+    **{f"{name}{octave}": f"{sharp}{octave}" for name, sharp in NAME_TO_SHARP.items() for octave in range(10)},
+}
+
+# Note name with octave for every MIDI note number, in sharp and flat spelling
+MIDI_TO_SHARP_NAME = tuple(f"{NOTES[midi_num % 12]}{midi_num // 12 - 1}" for midi_num in range(128))
+MIDI_TO_FLAT_NAME = tuple(f"{FLAT_NOTES[midi_num % 12]}{midi_num // 12 - 1}" for midi_num in range(128))
+
+# MIDI note number for every note name with a single-digit octave, in either spelling
+NAME_TO_MIDI = {
+    f"{name}{octave}": (octave + 1) * 12 + idx
+    for name, idx in NAME_TO_IDX.items()
+    for octave in range(10)
+}
+
 # Define scale intervals (half steps from root)
 SCALE_INTERVALS = {
     'major': [0, 2, 4, 5, 7, 9, 11],
@@ -56,6 +85,30 @@ CHORD_INTERVALS = {
     'minor_add9': [0, 3, 7, 14]
 }
 
+# Pitch classes (0-11) of every scale, keyed by (root pitch class, scale type)
+SCALE_INDEX_TABLE = {
+    (root_idx, scale_type): tuple((root_idx + i) % 12 for i in intervals)
+    for root_idx in range(12)
+    for scale_type, intervals in SCALE_INTERVALS.items()
+}
+
+# Chord type for each chord shape, keyed by its interval bitmask (bit i set for i half
+# steps above the root). Shapes reaching past the octave keep their high bits, so they
+# are only found if the lookup mask has those bits too.
+CHORD_MASK_TO_TYPE = {
+    sum(1 << i for i in intervals): chord_type
+    for chord_type, intervals in CHORD_INTERVALS.items()
+}
+
+# Array form of CHORD_MASK_TO_TYPE for batch lookups: index into CHORD_TYPES for every
+# 12-bit interval mask, -1 where no chord shape matches
+CHORD_TYPES = tuple(CHORD_INTERVALS)
+CHORD_MASK_TABLE = np.full(1 << 12, -1, np.int8)
+for _mask, _chord_type in CHORD_MASK_TO_TYPE.items():
+    if _mask < 1 << 12:
+        CHORD_MASK_TABLE[_mask] = CHORD_TYPES.index(_chord_type)
+del _mask, _chord_type
+
 # Roman numeral mapping for chord progression analysis
 ROMAN_NUMERALS = {
     0: 'I',
@@ -68,6 +121,39 @@ ROMAN_NUMERALS = {
 }
 
 
+def _roman_decoration(chord_type: str) -> Tuple[bool, str]:
+    """
+    Work out how a chord type changes its Roman numeral.
+    
+    Args:
+        chord_type: Type of chord (e.g., 'minor_7')
+        
+    Returns:
+        Tuple of (whether the numeral is lowercase, suffix to append)
+    """
+    lower = False
+    suffix = ''
+    
+    # Adjust for chord quality
+    if chord_type == 'minor' or chord_type.startswith('minor_'):
+        lower = True
+    elif chord_type == 'diminished' or chord_type.startswith('diminished_'):
+        lower = True
+        suffix = '°'
+    elif chord_type == 'augmented' or chord_type.startswith('augmented_'):
+        suffix = '+'
+        
+    # Add seventh notation if needed
+    if chord_type.endswith('7'):
+        suffix += '7'
+        
+    return lower, suffix
+
+
+# Roman numeral case and suffix for every chord type
+ROMAN_DECORATION = {chord_type: _roman_decoration(chord_type) for chord_type in CHORD_INTERVALS}
+
+
 class ChordQuality(Enum):
     MAJOR = "major"
     MINOR = "minor"
@@ -93,15 +179,7 @@ class MusicTheory:
         if not 0 <= midi_num <= 127:
             raise ValueError(f"MIDI note number must be between 0 and 127, got {midi_num}")
             
-        octave = (midi_num // 12) - 1
-        note_idx = midi_num % 12
-        
-        if use_flats:
-            note = FLAT_NOTES[note_idx]
-        else:
-            note = NOTES[note_idx]
-            
-        return f"{note}{octave}"
+        return (MIDI_TO_FLAT_NAME if use_flats else MIDI_TO_SHARP_NAME)[midi_num]
     
     @staticmethod
     def note_to_midi(note_str: str) -> int:
@@ -114,6 +192,11 @@ class MusicTheory:
         Returns:
             MIDI note number (0-127)
         """
+        midi_num = NAME_TO_MIDI.get(note_str)
+        if midi_num is not None:
+            return midi_num
+            
+        # Not a known name: parse it to report what is wrong
         if len(note_str) < 2:
             raise ValueError(f"Invalid note format: {note_str}")
             
@@ -121,11 +204,8 @@ class MusicTheory:
         note_name = note_str[:-1]  # Extract note without octave
         octave = int(note_str[-1])  # Extract octave
         
-        if note_name in NOTE_TO_NUMBER:
-            note_idx = NOTE_TO_NUMBER[note_name]
-        elif note_name in FLAT_NOTE_TO_NUMBER:
-            note_idx = FLAT_NOTE_TO_NUMBER[note_name]
-        else:
+        note_idx = NAME_TO_IDX.get(note_name)
+        if note_idx is None:
             raise ValueError(f"Unknown note name: {note_name}")
             
         return (octave + 1) * 12 + note_idx
@@ -141,24 +221,11 @@ class MusicTheory:
         Returns:
             Normalized note name (using sharps notation)
         """
-        # Handle notes with octave numbers
-        if note_name[-1].isdigit():
-            octave = note_name[-1]
-            name = note_name[:-1]
-            if name in NOTE_TO_NUMBER:
-                return f"{name}{octave}"
-            elif name in FLAT_NOTE_TO_NUMBER:
-                idx = FLAT_NOTE_TO_NUMBER[name]
-                return f"{NOTES[idx]}{octave}"
-        # Handle notes without octave numbers
-        else:
-            if note_name in NOTE_TO_NUMBER:
-                return note_name
-            elif note_name in FLAT_NOTE_TO_NUMBER:
-                idx = FLAT_NOTE_TO_NUMBER[note_name]
-                return NOTES[idx]
-                
-        raise ValueError(f"Unknown note name: {note_name}")
+        # Covers names with and without an octave number
+        normalized = NOTE_TO_SHARP.get(note_name)
+        if normalized is None:
+            raise ValueError(f"Unknown note name: {note_name}")
+        return normalized
     
     @staticmethod
     def get_scale(root: str, scale_type: str, octave: Optional[int] = None) -> List[str]:
@@ -173,32 +240,7 @@ class MusicTheory:
         Returns:
             List of notes in the scale
         """
-        if scale_type not in SCALE_INTERVALS:
-            raise ValueError(f"Unknown scale type: {scale_type}")
-            
-        # Normalize root note and get index
-        if root in NOTE_TO_NUMBER:
-            root_idx = NOTE_TO_NUMBER[root]
-        elif root in FLAT_NOTE_TO_NUMBER:
-            root_idx = FLAT_NOTE_TO_NUMBER[root]
-        else:
-            raise ValueError(f"Unknown root note: {root}")
-            
-        # Generate scale notes
-        scale = []
-        for interval in SCALE_INTERVALS[scale_type]:
-            note_idx = (root_idx + interval) % 12
-            note = NOTES[note_idx]
-            
-            if octave is not None:
-                # Handle octave wrapping
-                additional_octave = (root_idx + interval) // 12
-                note_octave = octave + additional_octave
-                note = f"{note}{note_octave}"
-                
-            scale.append(note)
-            
-        return scale
+        return list(_scale_notes(root, scale_type, octave))
     
     @staticmethod
     def get_chord(root: str, chord_type: str, octave: Optional[int] = None) -> List[str]:
@@ -213,32 +255,7 @@ class MusicTheory:
         Returns:
             List of notes in the chord
         """
-        if chord_type not in CHORD_INTERVALS:
-            raise ValueError(f"Unknown chord type: {chord_type}")
-            
-        # Normalize root note and get index
-        if root in NOTE_TO_NUMBER:
-            root_idx = NOTE_TO_NUMBER[root]
-        elif root in FLAT_NOTE_TO_NUMBER:
-            root_idx = FLAT_NOTE_TO_NUMBER[root]
-        else:
-            raise ValueError(f"Unknown root note: {root}")
-            
-        # Generate chord notes
-        chord = []
-        for interval in CHORD_INTERVALS[chord_type]:
-            note_idx = (root_idx + interval) % 12
-            note = NOTES[note_idx]
-            
-            if octave is not None:
-                # Handle octave wrapping
-                additional_octave = (root_idx + interval) // 12
-                note_octave = octave + additional_octave
-                note = f"{note}{note_octave}"
-                
-            chord.append(note)
-            
-        return chord
+        return list(_chord_notes(root, chord_type, octave))
     
     @staticmethod
     def recognize_chord(notes: List[str]) -> Tuple[Optional[str], Optional[str]]:
@@ -254,36 +271,10 @@ class MusicTheory:
         if not notes:
             return None, None
             
-        # Normalize notes and get indices
-        normalized_notes = [MusicTheory.normalize_note(note) for note in notes]
-        
-        # Remove octave information if present
-        clean_notes = []
-        for note in normalized_notes:
-            if note[-1].isdigit():
-                clean_notes.append(note[:-1])
-            else:
-                clean_notes.append(note)
-                
-        # Try each note as potential root
-        for root in clean_notes:
-            root_idx = NOTE_TO_NUMBER[root]
-            
-            # Calculate intervals from root
-            intervals = []
-            for note in clean_notes:
-                note_idx = NOTE_TO_NUMBER[note]
-                interval = (note_idx - root_idx) % 12
-                intervals.append(interval)
-                
-            intervals.sort()
-            
-            # Check against known chord types
-            for chord_type, chord_intervals in CHORD_INTERVALS.items():
-                if len(intervals) == len(chord_intervals) and intervals == chord_intervals:
-                    return root, chord_type
-                    
-        return None, None
+        root_idx, chord_type = _recognize_chord(tuple(notes))
+        if root_idx is None:
+            return None, None
+        return NOTES[root_idx], chord_type
     
     @staticmethod
     def analyze_chord_progression(chords: List[List[str]], key: str) -> List[str]:
@@ -301,28 +292,24 @@ class MusicTheory:
             return []
             
         # Get key index
-        if key in NOTE_TO_NUMBER:
-            key_idx = NOTE_TO_NUMBER[key]
-        elif key in FLAT_NOTE_TO_NUMBER:
-            key_idx = FLAT_NOTE_TO_NUMBER[key]
-        else:
+        key_idx = NAME_TO_IDX.get(key)
+        if key_idx is None:
             raise ValueError(f"Unknown key: {key}")
             
         # Get scale degrees in the key
-        major_scale = MusicTheory.get_scale(key, 'major')
-        scale_degrees = [NOTE_TO_NUMBER[note] for note in major_scale]
+        scale_degrees = SCALE_INDEX_TABLE[(key_idx, 'major')]
+        
+        # Identify all chords at once
+        roots, types = _recognize_chords(chords)
         
         result = []
-        for chord_notes in chords:
-            # Identify chord
-            root, chord_type = MusicTheory.recognize_chord(chord_notes)
-            
-            if root is None or chord_type is None:
+        for root_idx, type_idx in zip(roots.tolist(), types.tolist()):
+            if root_idx < 0:
                 result.append("?")
                 continue
+            chord_type = CHORD_TYPES[type_idx]
                 
             # Get scale degree
-            root_idx = NOTE_TO_NUMBER[root]
             degree = (root_idx - key_idx) % 12
             
             # Find position in the scale
@@ -330,22 +317,164 @@ class MusicTheory:
                 roman_idx = scale_degrees.index(degree)
                 roman = ROMAN_NUMERALS[roman_idx]
                 
-                # Adjust for chord quality
-                if chord_type == 'minor' or chord_type.startswith('minor_'):
+                # Adjust for chord quality and sevenths
+                lower, suffix = ROMAN_DECORATION[chord_type]
+                if lower:
                     roman = roman.lower()
-                elif chord_type == 'diminished' or chord_type.startswith('diminished_'):
-                    roman = roman.lower() + '°'
-                elif chord_type == 'augmented' or chord_type.startswith('augmented_'):
-                    roman = roman + '+'
-                    
-                # Add seventh notation if needed
-                if chord_type.endswith('7') or chord_type.endswith('_7'):
-                    roman = roman + '7'
-                    
-                result.append(roman)
+                result.append(roman + suffix)
             else:
                 # Non-diatonic chord
-                result.append(f"{root}({chord_type})")
+                result.append(f"{NOTES[root_idx]}({chord_type})")
                 
         return result
 
+
+# Chord and scale lookups are pure functions of their arguments and are queried
+# repeatedly while rendering, so their results are memoized as tuples.
+
+@lru_cache(maxsize=512)
+def _scale_notes(root: str, scale_type: str, octave: Optional[int]) -> Tuple[str, ...]:
+    """
+    Build the notes of a scale.
+    
+    Args:
+        root: Root note (e.g., 'C', 'F#')
+        scale_type: Type of scale (e.g., 'major', 'natural_minor')
+        octave: Optional octave number to include in the output
+        
+    Returns:
+        Tuple of note names
+    """
+    if scale_type not in SCALE_INTERVALS:
+        raise ValueError(f"Unknown scale type: {scale_type}")
+        
+    return _stack_intervals(root, SCALE_INTERVALS[scale_type], octave)
+
+
+@lru_cache(maxsize=512)
+def _chord_notes(root: str, chord_type: str, octave: Optional[int]) -> Tuple[str, ...]:
+    """
+    Build the notes of a chord.
+    
+    Args:
+        root: Root note (e.g., 'C', 'F#')
+        chord_type: Type of chord (e.g., 'major', 'minor_7')
+        octave: Optional octave number to include in the output
+        
+    Returns:
+        Tuple of note names
+    """
+    if chord_type not in CHORD_INTERVALS:
+        raise ValueError(f"Unknown chord type: {chord_type}")
+        
+    return _stack_intervals(root, CHORD_INTERVALS[chord_type], octave)
+
+
+def _stack_intervals(root: str, intervals: List[int], octave: Optional[int]) -> Tuple[str, ...]:
+    """
+    Build the notes found at the given intervals above a root note.
+    
+    Args:
+        root: Root note (e.g., 'C', 'F#')
+        intervals: Half steps above the root for each note
+        octave: Optional octave number to include in the output
+        
+    Returns:
+        Tuple of note names
+    """
+    # Normalize root note and get index
+    root_idx = NAME_TO_IDX.get(root)
+    if root_idx is None:
+        raise ValueError(f"Unknown root note: {root}")
+        
+    notes = []
+    for interval in intervals:
+        note_idx = (root_idx + interval) % 12
+        note = NOTES[note_idx]
+        
+        if octave is not None:
+            # Handle octave wrapping
+            additional_octave = (root_idx + interval) // 12
+            note_octave = octave + additional_octave
+            note = f"{note}{note_octave}"
+            
+        notes.append(note)
+        
+    return tuple(notes)
+
+
+@lru_cache(maxsize=2048)
+def _recognize_chord(notes: Tuple[str, ...]) -> Tuple[Optional[int], Optional[str]]:
+    """
+    Recognize chord type from a tuple of notes.
+    
+    Args:
+        notes: Tuple of notes (e.g., ('C', 'E', 'G'))
+        
+    Returns:
+        Tuple of (root pitch class 0-11, chord_type) or (None, None) if not recognized
+    """
+    # Get the distinct pitch classes in input order, ignoring octave information if present,
+    # so doubled notes (e.g. C4 and C5) are only tried once as a root
+    pitch_classes = []
+    pc_mask = 0
+    for note in notes:
+        note_idx = NOTE_TO_PITCH_CLASS.get(note)
+        if note_idx is None:
+            raise ValueError(f"Unknown note name: {note}")
+        if not pc_mask & (1 << note_idx):
+            pc_mask |= 1 << note_idx
+            pitch_classes.append(note_idx)
+        
+    # Try each note as potential root: rotate the mask so the root is bit 0 and look it up
+    for root_idx in pitch_classes:
+        rotated = ((pc_mask >> root_idx) | (pc_mask << (12 - root_idx))) & 0xFFF
+        chord_type = CHORD_MASK_TO_TYPE.get(rotated)
+        if chord_type is not None:
+            return root_idx, chord_type
+                
+    return None, None
+
+
+def _recognize_chords(chords: List[List[str]]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Recognize many chords at once; the batch counterpart of _recognize_chord.
+    
+    Args:
+        chords: List of chords, each a list of notes
+        
+    Returns:
+        Tuple of (root pitch classes, indices into CHORD_TYPES) arrays, both -1 for
+        chords that were not recognized
+    """
+    # Pitch classes of each chord in input order, padded with -1 to a common width
+    width = max(len(chord_notes) for chord_notes in chords)
+    rows = []
+    for chord_notes in chords:
+        row = []
+        for note in chord_notes:
+            note_idx = NOTE_TO_PITCH_CLASS.get(note)
+            if note_idx is None:
+                raise ValueError(f"Unknown note name: {note}")
+            row.append(note_idx)
+        rows.append(row + [-1] * (width - len(row)))
+    pitch_classes = np.array(rows, np.int64).reshape(len(chords), width)
+    
+    present = pitch_classes >= 0
+    pc_masks = np.bitwise_or.reduce(
+        np.where(present, 1 << np.maximum(pitch_classes, 0), 0), axis=1
+    )
+    roots = np.full(len(chords), -1, np.int64)
+    types = np.full(len(chords), -1, np.int64)
+    
+    # Try each note position as potential root, keeping the first match per chord;
+    # a doubled note just repeats an earlier, identical lookup
+    for column in range(width):
+        root = np.maximum(pitch_classes[:, column], 0)
+        rotated = ((pc_masks >> root) | (pc_masks << (12 - root))) & 0xFFF
+        found = CHORD_MASK_TABLE[rotated]
+        take = (roots < 0) & present[:, column] & (found >= 0)
+        roots[take] = root[take]
+        types[take] = found[take]
+        
+    return roots, types
@@ -1,154 +1,3 @@
-import pygame
-import numpy as np
-from ..utility.config import Config
-from modules.utility.constants import WHITE_KEY_COLOR, BLACK_KEY_COLOR, WHITE_KEY_PRESSED_COLOR, BLACK_KEY_PRESSED_COLOR
-
-class PianoRenderer:
-    """
-    Class responsible for rendering a piano keyboard on screen
-    and handling key highlighting for pressed notes.
-    """
-    def __init__(self, config):
-        """
-        Initialize the piano renderer with configuration parameters.
-        
-        Args:
-            config (Config): Application configuration
-        """
-        self.config = config
-        self.screen_width = config.screen_width
-        self.screen_height = config.screen_height
-        self.piano_height = config.piano_height
-        self.y_position = config.screen_height - config.piano_height
-        
-        # Piano key dimensions and positions
-        self.white_key_width = 0
-        self.white_key_height = self.piano_height
-        self.black_key_width = 0
-        self.black_key_height = self.piano_height * 0.6
-        
-        # Lists to store the positions and dimensions of each piano key
-        self.white_keys = []  # (x, y, width, height, note_number)
-        self.black_keys = []  # (x, y, width, height, note_number)
-        
-        # Map note numbers to their respective keys
-        self.note_to_key = {}
-        
-        # Set of currently pressed keys
-        self.pressed_keys = set()
-        
-        # Calculate the initial layout
-        self.calculate_layout()
-    
-    def calculate_layout(self):
-        """Calculate the layout of the piano keys based on the current screen dimensions."""
-        # Define constants
-        num_white_keys = 52  # C1 to C6 range (52 white keys)
-        
-        # Calculate white key dimensions
-        self.white_key_width = self.screen_width / num_white_keys
-        self.white_key_height = self.piano_height
-        
-        # Calculate black key dimensions
-        self.black_key_width = self.white_key_width * 0.6
-        self.black_key_height = self.piano_height * 0.6
-        
-        # Clear the key lists
-        self.white_keys = []
-        self.black_keys = []
-        self.note_to_key = {}
-        
-        # MIDI note number for C1 (first white key)
-        start_note = 24
-        
-        # Generate the white keys
-        for i in range(num_white_keys):
-            x = i * self.white_key_width
-            y = self.y_position
-            
-            # Calculate the MIDI note number for this white key
-            note_number = start_note + i
-            
-            # Adjust for black keys (every 2nd and 3rd, 5th, 6th, and 7th keys in an octave have black keys after them)
-            if i % 7 != 2 and i % 7 != 6:
-                note_number = start_note + i + (i // 7) * 5 + min(i % 7, 2) + max(0, (i % 7) - 3)
-            
-            self.white_keys.append((x, y, self.white_key_width, self.white_key_height, note_number))
-            self.note_to_key[note_number] = ('white', len(self.white_keys) - 1)
-        
-        # Generate the black keys
-        black_key_indices = [0, 1, 3, 4, 5]  # Indices of white keys that have black keys to their right (C, D, F, G, A)
-        
-        for i in range(num_white_keys - 1):
-            if i % 7 in black_key_indices:
-                x = (i + 0.7) * self.white_key_width - self.black_key_width / 2
-                y = self.y_position
-                
-                # Calculate the MIDI note number for this black key
-                if i % 7 < 2:
-                    # C# and D#
-                    note_number = start_note + i + (i // 7) * 5 + min(i % 7, 2) + max(0, (i % 7) - 3) + 1
-                else:
-                    # F#, G#, A#
-                    note_number = start_note + i + (i // 7) * 5 + min(i % 7, 2) + max(0, (i % 7) - 3) + 1
-                
-                self.black_keys.append((x, y, self.black_key_width, self.black_key_height, note_number))
-                self.note_to_key[note_number] = ('black', len(self.black_keys) - 1)
-    
-    def resize(self, screen_width, screen_height):
-        """
-        Resize the piano keyboard based on new screen dimensions.
-        
-        Args:
-            screen_width (int): New screen width
-            screen_height (int): New screen height
-        """
-        self.screen_width = screen_width
-        self.screen_height = screen_height
-        self.y_position = screen_height - self.piano_height
-        
-        # Recalculate the piano layout
-        self.calculate_layout()
-    
-    def press_key(self, note_number):
-        """
-        Mark a piano key as pressed.
-        
-        Args:
-            note_number (int): MIDI note number to press
-        """
-        if note_number in self.note_to_key:
-            self.pressed_keys.add(note_number)
-    
-    def release_key(self, note_number):
-        """
-        Mark a piano key as released.
-        
-        Args:
-            note_number (int): MIDI note number to release
-        """
-        if note_number in self.pressed_keys:
-            self.pressed_keys.remove(note_number)
-    
-    def draw(self, surface):
-        """
-        Draw the piano keyboard on the provided surface.
-        
-        Args:
-            surface (pygame.Surface): Surface to draw the piano on
-        """
-        # Draw white keys
-        for i, (x, y, width, height, note_number) in enumerate(self.white_keys):
-            color = WHITE_KEY_PRESSED_COLOR if note_number in self.pressed_keys else WHITE_KEY_COLOR
-            pygame.draw.rect(surface, color, (x, y, width, height))
-            pygame.draw.rect(surface, (0, 0, 0), (x, y, width, height), 1)
-        
-        # Draw black keys (on top of white keys)
-        for i, (x, y, width, height, note_number) in enumerate(self.black_keys):
-            color = BLACK_KEY_PRESSED_COLOR if note_number in self.pressed_keys else BLACK_KEY_COLOR
-            pygame.draw.rect(surface, color, (x, y, width, height))
-            pygame.draw.rect(surface, (0, 0, 0), (x, y, width, height), 1)
-
 import pygame
 from typing import Dict, List, Optional, Set, Tuple
 import math
@@ -179,6 +28,7 @@ class PianoRenderer:
     WHITE_KEY_HIGHLIGHT_COLOR = (102, 178, 255)  # Light blue
     BLACK_KEY_HIGHLIGHT_COLOR = (51, 153, 255)   # Darker blue
     WHITE_KEY_BORDER_COLOR = (180, 180, 180)
+    BACKGROUND_COLOR = (0, 0, 0)
     
     # Labels
     NOTE_NAMES = ['C', '', 'D', '', 'E', 'F', '', 'G', '', 'A', '', 'B']
@@ -213,6 +63,11 @@ class PianoRenderer:
         # Font for note labels
         self.font: Optional[pygame.font.Font] = None
         self.show_note_labels = True
+        
+        # Pre-rendered keyboard with no keys pressed, and cached note label surfaces
+        self._keys_bg: Optional[pygame.Surface] = None
+        self._keyboard_rect = pygame.Rect(0, 0, 0, 0)
+        self._label_cache: Dict[int, pygame.Surface] = {}
     
     def setup(self, surface: pygame.Surface):
         """
@@ -226,6 +81,7 @@ class PianoRenderer:
         
         # Calculate key positions
         self._calculate_key_positions()
+        self._build_key_background()
     
     def _calculate_key_positions(self):
         """Calculate the positions of all piano keys."""
@@ -300,6 +156,69 @@ class PianoRenderer:
                         x, y_position, adjusted_black_key_width, self.BLACK_KEY_HEIGHT
                     )
     
+    def _build_key_background(self):
+        """Pre-render the keyboard with no keys pressed, in the target surface's pixel format."""
+        self._label_cache.clear()
+        if not self.white_key_positions:
+            self._keys_bg = None
+            return
+        
+        key_rects = list(self.white_key_positions.values()) + list(self.black_key_positions.values())
+        self._keyboard_rect = key_rects[0].unionall(key_rects[1:])
+        offset_x, offset_y = -self._keyboard_rect.x, -self._keyboard_rect.y
+        
+        self._keys_bg = pygame.Surface(self._keyboard_rect.size).convert(self.surface)
+        self._keys_bg.fill(self.BACKGROUND_COLOR)
+        
+        for note, rect in self.white_key_positions.items():
+            self._draw_white_key(self._keys_bg, note, rect.move(offset_x, offset_y), self.WHITE_KEY_COLOR)
+        
+        for rect in self.black_key_positions.values():
+            pygame.draw.rect(self._keys_bg, self.BLACK_KEY_COLOR, rect.move(offset_x, offset_y))
+    
+    def _draw_white_key(self, surface: pygame.Surface, note: int, rect: pygame.Rect, color: Tuple[int, int, int]):
+        """
+        Draw a white key with its border and note label.
+        
+        Args:
+            surface: Surface to draw on
+            note: MIDI note number
+            rect: Key rectangle on the surface
+            color: Fill color of the key
+        """
+        pygame.draw.rect(surface, color, rect)
+        
+        # Draw border for white key
+        pygame.draw.rect(surface, self.WHITE_KEY_BORDER_COLOR, rect, 1)
+        
+        # Draw note label if enabled
+        if self.show_note_labels:
+            label_surface = self._get_label(note)
+            if label_surface is not None:
+                label_pos = (rect.x + 2, rect.bottom - label_surface.get_height() - 2)
+                surface.blit(label_surface, label_pos)
+    
+    def _get_label(self, note: int) -> Optional[pygame.Surface]:
+        """
+        Get the cached label surface for a key.
+        
+        Args:
+            note: MIDI note number
+            
+        Returns:
+            The rendered label, or None if the key is not labelled
+        """
+        # Only label C notes
+        if note % self.KEYS_PER_OCTAVE != self.OCTAVE_START_NOTE:
+            return None
+        
+        label_surface = self._label_cache.get(note)
+        if label_surface is None:
+            octave = (note // self.KEYS_PER_OCTAVE) - 1  # MIDI note 0 is C-1
+            label_surface = self.font.render(f"C{octave}", True, (0, 0, 0))
+            self._label_cache[note] = label_surface
+        return label_surface
+    
     def _is_white_key(self, note: int) -> bool:
         """
         Determine if a note is a white key.
@@ -322,38 +241,26 @@ class PianoRenderer:
             active_notes: Set of currently pressed MIDI notes from user input
             playback_notes: Set of notes currently being played from MIDI file
         """
-        if not self.surface:
+        if not self.surface or self._keys_bg is None:
             return
             
         # Get all notes that should be highlighted (either pressed or played)
         highlighted_notes = active_notes.union(playback_notes)
         
-        # Draw white keys first
-        for note, rect in self.white_key_positions.items():
-            if note in highlighted_notes:
-                # Draw highlighted white key
-                pygame.draw.rect(self.surface, self.WHITE_KEY_HIGHLIGHT_COLOR, rect)
-                # Start animation for newly pressed keys
-                if note not in self.animation_frames:
-                    self.animation_frames[note] = self.max_animation_frames
-            else:
-                # Draw normal white key
-                pygame.draw.rect(self.surface, self.WHITE_KEY_COLOR, rect)
-            
-            # Draw border for white key
-            pygame.draw.rect(self.surface, self.WHITE_KEY_BORDER_COLOR, rect, 1)
-            
-            # Draw note label if enabled
-            if self.show_note_labels:
-                note_in_octave = note % self.KEYS_PER_OCTAVE
-                octave = (note // self.KEYS_PER_OCTAVE) - 1  # MIDI note 0 is C-1
-                
-                # Only label C notes (or all white keys if configured)
-                if note_in_octave == self.OCTAVE_START_NOTE:
-                    label = f"C{octave}"
-                    label_surface = self.font.render(label, True, (0, 0, 0))
-                    label_pos = (rect.x + 2, rect.bottom - label_surface.get_height() - 2)
-                    self.surface.blit(label_surface, label_pos)
+        # Start from the pre-rendered unpressed keyboard
+        self.surface.blit(self._keys_bg, self._keyboard_rect)
+        
+        # Draw highlighted white keys; each covers parts of its black neighbours
+        redrawn_white_keys = []
+        for note in highlighted_notes:
+            rect = self.white_key_positions.get(note)
+            if rect is None:
+                continue
+            self._draw_white_key(self.surface, note, rect, self.WHITE_KEY_HIGHLIGHT_COLOR)
+            redrawn_white_keys.append(rect)
+            # Start animation for newly pressed keys
+            if note not in self.animation_frames:
+                self.animation_frames[note] = self.max_animation_frames
         
         # Then draw black keys (so they appear on top)
         for note, rect in self.black_key_positions.items():
@@ -363,8 +270,8 @@ class PianoRenderer:
                 # Start animation for newly pressed keys
                 if note not in self.animation_frames:
                     self.animation_frames[note] = self.max_animation_frames
-            else:
-                # Draw normal black key
+            elif redrawn_white_keys and rect.collidelist(redrawn_white_keys) != -1:
+                # Draw normal black key back over a highlighted neighbour
                 pygame.draw.rect(self.surface, self.BLACK_KEY_COLOR, rect)
         
         # Update animations
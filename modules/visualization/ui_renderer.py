@@ -31,10 +31,22 @@ class UIRenderer:
             'warning': (255, 165, 0),  # Orange
             'highlight': (255, 215, 0)  # Gold
         }
+        
+        # Pre-rendered static text and overlays, reused across frames
+        self._label_cache: Dict[Tuple[str, str, Tuple[int, ...]], pygame.Surface] = {}
+        self._overlay_cache: Dict[int, pygame.Surface] = {}
         self._init_fonts()
         
+        # Status text builders keyed by mode, so the per-frame lookup is a single hash
+        self._status_text_fns = {
+            AppMode.FREESTYLE: self._get_freestyle_status_text,
+            AppMode.LEARNING: self._get_learning_status_text,
+            AppMode.ANALYSIS: self._get_analysis_status_text,
+        }
+        
     def _init_fonts(self):
         """Initialize the fonts used in the UI."""
+        self._label_cache.clear()
         pygame.font.init()
         try:
             # Try to load a nice font, fall back to default if not available
@@ -62,6 +74,47 @@ class UIRenderer:
         """
         self.width = width
         self.height = height
+        self._overlay_cache.clear()
+        
+    def _render_static_text(self, font_name: str, text: str, color: Tuple[int, ...]) -> pygame.Surface:
+        """
+        Get a rendered text surface, rasterizing it only the first time it is requested.
+        
+        Only use this for text drawn from a small fixed set of strings.
+        
+        Args:
+            font_name: Key into self.fonts
+            text: Text to render
+            color: Text color
+            
+        Returns:
+            The rendered text surface
+        """
+        key = (font_name, text, color)
+        text_surface = self._label_cache.get(key)
+        if text_surface is None:
+            text_surface = self.fonts[font_name].render(text, True, color)
+            if pygame.display.get_surface() is not None:
+                text_surface = text_surface.convert_alpha()
+            self._label_cache[key] = text_surface
+        return text_surface
+    
+    def _get_overlay(self, alpha: int) -> pygame.Surface:
+        """
+        Get a cached full-window black overlay with the given transparency.
+        
+        Args:
+            alpha: Transparency value (0-255)
+            
+        Returns:
+            The overlay surface
+        """
+        overlay = self._overlay_cache.get(alpha)
+        if overlay is None:
+            overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
+            overlay.fill((0, 0, 0, alpha))  # Black with alpha
+            self._overlay_cache[alpha] = overlay
+        return overlay
         
     def render_header(self, surface: pygame.Surface, app_state: AppState):
         """
@@ -77,12 +130,12 @@ class UIRenderer:
         pygame.draw.line(surface, self.colors['accent'], (0, 50), (self.width, 50), 2)
         
         # Application title
-        title_text = self.fonts['title'].render("Piano Trainer", True, self.colors['text'])
+        title_text = self._render_static_text('title', "Piano Trainer", self.colors['text'])
         surface.blit(title_text, (20, 10))
         
         # Current mode
         mode_text = f"Mode: {app_state.mode.name.capitalize()}"
-        mode_surface = self.fonts['normal'].render(mode_text, True, self.colors['accent'])
+        mode_surface = self._render_static_text('normal', mode_text, self.colors['accent'])
         surface.blit(mode_surface, (self.width - mode_surface.get_width() - 20, 15))
         
     def render_status_bar(self, surface: pygame.Surface, app_state: AppState):
@@ -105,7 +158,7 @@ class UIRenderer:
         
         # Help text on the right
         help_text = "Press ESC to exit, F1 for help"
-        help_surface = self.fonts['small'].render(help_text, True, self.colors['text'])
+        help_surface = self._render_static_text('small', help_text, self.colors['text'])
         surface.blit(help_surface, (self.width - help_surface.get_width() - 10, self.height - status_height + 7))
         
     def _get_status_text(self, app_state: AppState) -> str:
@@ -118,17 +171,25 @@ class UIRenderer:
         Returns:
             Status text to display
         """
-        if app_state.mode == AppMode.FREESTYLE:
-            if app_state.midi_input and app_state.midi_input.is_connected():
-                return f"MIDI Input: {app_state.midi_input.get_device_name()}"
-            else:
-                return "No MIDI device connected. Use computer keyboard instead."
-        elif app_state.mode == AppMode.LEARNING:
-            return f"Song: {app_state.current_song_name} | Difficulty: {app_state.current_difficulty}"
-        elif app_state.mode == AppMode.ANALYSIS:
-            return f"Analyzing: {app_state.current_song_name}"
-        else:
+        status_text_fn = self._status_text_fns.get(app_state.mode)
+        if status_text_fn is None:
             return "Ready"
+        return status_text_fn(app_state)
+    
+    def _get_freestyle_status_text(self, app_state: AppState) -> str:
+        """Get the status text for freestyle mode."""
+        if app_state.midi_input and app_state.midi_input.is_connected():
+            return f"MIDI Input: {app_state.midi_input.get_device_name()}"
+        else:
+            return "No MIDI device connected. Use computer keyboard instead."
+    
+    def _get_learning_status_text(self, app_state: AppState) -> str:
+        """Get the status text for learning mode."""
+        return f"Song: {app_state.current_song_name} | Difficulty: {app_state.current_difficulty}"
+    
+    def _get_analysis_status_text(self, app_state: AppState) -> str:
+        """Get the status text for analysis mode."""
+        return f"Analyzing: {app_state.current_song_name}"
     
     def render_freestyle_mode(self, surface: pygame.Surface, app_state: AppState):
         """
@@ -240,12 +301,10 @@ class UIRenderer:
             score_tracker: Score tracker with final results
         """
         # Semi-transparent overlay
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 200))  # Black with alpha
-        surface.blit(overlay, (0, 0))
+        surface.blit(self._get_overlay(200), (0, 0))
         
         # Game over text
-        game_over_text = self.fonts['title'].render("Song Complete!", True, self.colors['accent'])
+        game_over_text = self._render_static_text('title', "Song Complete!", self.colors['accent'])
         text_x = (self.width - game_over_text.get_width()) // 2
         surface.blit(game_over_text, (text_x, 150))
         
@@ -267,7 +326,7 @@ class UIRenderer:
             y_pos += 40
             
         # Continue prompt
-        continue_text = self.fonts['normal'].render("Press any key to continue", True, self.colors['text'])
+        continue_text = self._render_static_text('normal', "Press any key to continue", self.colors['text'])
         text_x = (self.width - continue_text.get_width()) // 2
         surface.blit(continue_text, (text_x, y_pos + 30))
         
@@ -280,11 +339,9 @@ class UIRenderer:
             app_state: Current application state
         """
         # Semi-transparent overlay
-        overlay = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 230))  # Black with alpha
-        surface.blit(overlay, (0, 0))
+        surface.blit(self._get_overlay(230), (0, 0))
         
         # Help title
-        help_text = self.fonts['title'].render("Piano Trainer - Help", True, self.colors['accent'])
+        help_text = self._render_static_text('title', "Piano Trainer - Help", self.colors['accent'])
         text_
 
@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+import unittest
+from unittest import mock
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+import pygame.midi
+
+from modules.core.event_handler import EventHandler, EventType
+
+
+class FakeInput:
+    """Stands in for pygame.midi.Input, handing out fed events to whichever thread reads them."""
+
+    def __init__(self, device_id):
+        self._lock = threading.Lock()
+        self._pending = []
+        self.read_threads = set()
+        self.closed = False
+
+    def feed(self, events):
+        with self._lock:
+            self._pending.extend(events)
+
+    def poll(self):
+        with self._lock:
+            return bool(self._pending)
+
+    def read(self, num_events):
+        with self._lock:
+            self.read_threads.add(threading.get_ident())
+            events, self._pending = self._pending[:num_events], self._pending[num_events:]
+            return events
+
+    def close(self):
+        self.closed = True
+
+
+class TestMIDIPolling(unittest.TestCase):
+    def setUp(self):
+        pygame.display.init()
+        self.addCleanup(pygame.display.quit)
+
+        self.devices = []
+
+        def make_input(device_id):
+            device = FakeInput(device_id)
+            self.devices.append(device)
+            return device
+
+        for name, value in [
+            ("get_init", lambda: True),
+            ("get_count", lambda: 1),
+            ("get_device_info", lambda device_id: (b"fake", b"Fake Keyboard", 1, 0, 0)),
+            ("Input", make_input),
+        ]:
+            patcher = mock.patch.object(pygame.midi, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+        self.app_state = mock.Mock()
+        self.handler = EventHandler(self.app_state)
+        self.received = []
+        self.handler.register_callback(EventType.MIDI_NOTE_ON, lambda data: self.received.append(("on",) + data))
+        self.handler.register_callback(EventType.MIDI_NOTE_OFF, lambda data: self.received.append(("off",) + data))
+        self.handler.register_callback(
+            EventType.MIDI_CONTROL_CHANGE, lambda data: self.received.append(("cc",) + data)
+        )
+
+    def wait_for_reads(self, total):
+        deadline = time.monotonic() + 5.0
+        while self.handler._midi_write_index < total:
+            self.assertLess(time.monotonic(), deadline, "poll thread stopped reading")
+            time.sleep(0.001)
+
+    def test_every_event_is_delivered_once(self):
+        self.handler.init_midi_input(0)
+        self.addCleanup(self.handler._trigger_event, EventType.APP_QUIT, None)
+        device = self.devices[0]
+        midi_input = self.handler.midi_input
+        self.assertFalse(midi_input.is_listening)
+
+        expected = []
+        total = 0
+        # Small bursts, then one larger than a single read batch
+        for burst_size in [1, 3, 64, 200, 7, 2500]:
+            events = []
+            for i in range(burst_size):
+                note = 36 + (total + i) % 60
+                kind = (total + i) % 4
+                if kind == 0:
+                    events.append([[0x90, note, 100, 0], total + i])
+                    expected.append(("on", note, 100))
+                elif kind == 1:
+                    events.append([[0x90, note, 0, 0], total + i])
+                    expected.append(("off", note, 0))
+                elif kind == 2:
+                    events.append([[0x81, note, 64, 0], total + i])
+                    expected.append(("off", note, 0))
+                else:
+                    events.append([[0xB0, 64, note, 0], total + i])
+                    expected.append(("cc", 64, note))
+            device.feed(events)
+            total += burst_size
+            self.wait_for_reads(total)
+            self.handler.process_events()
+
+        self.assertEqual(self.received, expected)
+        self.assertEqual(device.read_threads, {self.handler._midi_thread.ident})
+        self.app_state.handle_midi_note_on.assert_not_called()
+        self.app_state.handle_midi_note_off.assert_not_called()
+
+    def test_quit_closes_device(self):
+        self.handler.init_midi_input(0)
+        self.handler._trigger_event(EventType.APP_QUIT, None)
+        self.assertFalse(self.handler._midi_thread.is_alive())
+        self.assertTrue(self.devices[0].closed)
+        self.assertFalse(self.handler.midi_input.is_connected())
+
+
+if __name__ == "__main__":
+    unittest.main()
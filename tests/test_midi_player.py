@@ -0,0 +1,110 @@
+import os
+import random
+import tempfile
+import unittest
+from unittest import mock
+
+import mido
+import numpy as np
+
+from modules.midi.midi_player import MIDIPlayer
+
+
+def reference_notes(midi_file):
+    """Pair notes while playing the file back through mido, which applies tempo itself."""
+    notes = []
+    active_notes = {}
+    current_time = 0.0
+    for msg in midi_file:
+        current_time += msg.time
+        if msg.type == 'note_on' and msg.velocity > 0:
+            active_notes[(msg.note, msg.channel)] = current_time
+        elif msg.type == 'note_off' or msg.type == 'note_on':
+            start_time = active_notes.pop((msg.note, msg.channel), None)
+            if start_time is not None:
+                notes.append((msg.note, msg.channel, start_time, current_time))
+    notes.sort(key=lambda note: note[2])
+    return notes
+
+
+class TestMIDIPlayerParse(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.object(MIDIPlayer, '_init_midi_output', lambda self: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.player = MIDIPlayer(None)
+
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.midi_path = os.path.join(temp_dir.name, 'test.mid')
+
+    def assertParsesLikeReference(self, midi_file):
+        midi_file.save(self.midi_path)
+        self.assertTrue(self.player.load_midi_file(self.midi_path))
+
+        expected = reference_notes(mido.MidiFile(self.midi_path))
+        parsed = [(note.note, note.channel, note.start_time, note.end_time)
+                  for note in self.player.notes]
+        self.assertEqual(len(parsed), len(expected))
+        for got, want in zip(parsed, expected):
+            self.assertEqual(got[:2], want[:2])
+            self.assertAlmostEqual(got[2], want[2], places=9)
+            self.assertAlmostEqual(got[3], want[3], places=9)
+
+    def test_tempo_change_mid_file(self):
+        midi_file = mido.MidiFile(ticks_per_beat=480)
+        conductor = mido.MidiTrack([
+            mido.MetaMessage('set_tempo', tempo=500000, time=0),
+            mido.MetaMessage('set_tempo', tempo=300000, time=960),
+            mido.MetaMessage('set_tempo', tempo=800000, time=720),
+        ])
+        notes = mido.MidiTrack()
+        for i in range(16):
+            notes.append(mido.Message('note_on', note=60 + i % 5, velocity=90, time=0 if i == 0 else 120))
+            notes.append(mido.Message('note_off', note=60 + i % 5, velocity=0, time=200))
+        midi_file.tracks.extend([conductor, notes])
+        self.assertParsesLikeReference(midi_file)
+
+    def test_overlapping_notes_and_velocity_zero_offs(self):
+        midi_file = mido.MidiFile(ticks_per_beat=96)
+        track = mido.MidiTrack([
+            mido.Message('note_on', note=60, velocity=80, time=0),
+            # Same pitch struck again before its note off: only the second note is kept
+            mido.Message('note_on', note=60, velocity=70, time=48),
+            mido.Message('note_on', note=64, velocity=70, time=0),
+            # A tempo change in the note track applies to every track
+            mido.MetaMessage('set_tempo', tempo=250000, time=24),
+            mido.Message('note_on', note=60, velocity=0, time=24),
+            mido.Message('note_off', note=64, velocity=0, time=96),
+            mido.Message('note_on', note=67, velocity=100, time=0, channel=3),
+            mido.Message('note_on', note=67, velocity=0, time=48, channel=3),
+            # Stray note off without a pending note on
+            mido.Message('note_off', note=72, velocity=0, time=10),
+        ])
+        midi_file.tracks.append(track)
+        self.assertParsesLikeReference(midi_file)
+
+    def test_ticks_to_seconds_matches_segmentwise_tick2second(self):
+        ticks_per_beat = 384
+        tempo_changes = [(0, 600000), (500, 400000), (500, 450000), (2000, 900000)]
+        tempo_map = MIDIPlayer._build_tempo_map(tempo_changes, ticks_per_beat)
+
+        rng = random.Random(7)
+        ticks = sorted(rng.randint(0, 5000) for _ in range(200))
+        seconds = MIDIPlayer._ticks_to_seconds(np.array(ticks), tempo_map)
+
+        for tick, second in zip(ticks, seconds.tolist()):
+            # Walk the tempo segments, the last change at a tick winning
+            expected = 0.0
+            segment_start, tempo = 0, 500000
+            for change_tick, change_tempo in tempo_changes:
+                if change_tick > tick:
+                    break
+                expected += mido.tick2second(change_tick - segment_start, ticks_per_beat, tempo)
+                segment_start, tempo = change_tick, change_tempo
+            expected += mido.tick2second(tick - segment_start, ticks_per_beat, tempo)
+            self.assertAlmostEqual(second, expected, places=9)
+
+
+if __name__ == '__main__':
+    unittest.main()
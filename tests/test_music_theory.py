@@ -0,0 +1,112 @@
+import random
+import unittest
+
+from modules.utility.music_theory import (
+    CHORD_INTERVALS,
+    CHORD_TYPES,
+    FLAT_NOTES,
+    NOTES,
+    MusicTheory,
+    _recognize_chords,
+)
+
+
+def reference_recognize_chord(notes):
+    """Interval-list comparison the mask lookups must match, trying each distinct pitch class as root."""
+    pitch_classes = []
+    for note in notes:
+        name = note.rstrip("0123456789")
+        note_idx = NOTES.index(name) if name in NOTES else FLAT_NOTES.index(name)
+        if note_idx not in pitch_classes:
+            pitch_classes.append(note_idx)
+
+    for root_idx in pitch_classes:
+        intervals = sorted((note_idx - root_idx) % 12 for note_idx in pitch_classes)
+        for chord_type, chord_intervals in CHORD_INTERVALS.items():
+            if intervals == chord_intervals:
+                return NOTES[root_idx], chord_type
+    return None, None
+
+
+def random_chord(rng):
+    names = rng.choice([NOTES, FLAT_NOTES])
+    chord = []
+    for _ in range(rng.randint(1, 6)):
+        note = rng.choice(names)
+        if rng.random() < 0.5:
+            note += str(rng.randint(1, 7))
+        chord.append(note)
+    return chord
+
+
+def known_chord(rng):
+    """A spelled-out chord shape, shuffled, with octaves and doublings mixed in."""
+    root_idx = rng.randrange(12)
+    intervals = rng.choice(list(CHORD_INTERVALS.values()))
+    chord = [f"{NOTES[(root_idx + i) % 12]}{rng.randint(2, 6)}" for i in intervals]
+    chord += rng.sample(chord, rng.randint(0, 2))
+    rng.shuffle(chord)
+    return chord
+
+
+class TestRecognizeChord(unittest.TestCase):
+    def test_octave_doubled_chords(self):
+        self.assertEqual(MusicTheory.recognize_chord(['C4', 'E4', 'G4', 'C5']), ('C', 'major'))
+        self.assertEqual(MusicTheory.recognize_chord(['A3', 'C4', 'E4', 'A4', 'E5']), ('A', 'minor'))
+        self.assertEqual(MusicTheory.recognize_chord(['G2', 'G3', 'B3', 'D4', 'F4']), ('G', 'dominant_7'))
+        self.assertEqual(MusicTheory.recognize_chord(['C4', 'C5']), (None, None))
+
+    def test_matches_reference(self):
+        rng = random.Random(4321)
+        chords = [random_chord(rng) for _ in range(500)] + [known_chord(rng) for _ in range(500)]
+        for chord in chords:
+            self.assertEqual(MusicTheory.recognize_chord(chord), reference_recognize_chord(chord), chord)
+
+    def test_batch_matches_single(self):
+        rng = random.Random(99)
+        chords = [random_chord(rng) for _ in range(300)] + [known_chord(rng) for _ in range(300)]
+        chords.append(['C4', 'E4', 'G4', 'C5'])
+        rng.shuffle(chords)
+
+        roots, types = _recognize_chords(chords)
+        for chord, root_idx, type_idx in zip(chords, roots.tolist(), types.tolist()):
+            if root_idx < 0:
+                self.assertEqual(type_idx, -1)
+                batch = (None, None)
+            else:
+                batch = (NOTES[root_idx], CHORD_TYPES[type_idx])
+            self.assertEqual(batch, MusicTheory.recognize_chord(chord), chord)
+
+    def test_unknown_note_raises(self):
+        with self.assertRaises(ValueError):
+            MusicTheory.recognize_chord(['C4', 'H4'])
+        with self.assertRaises(ValueError):
+            _recognize_chords([['C4', 'E4'], ['X']])
+
+
+class TestAnalyzeChordProgression(unittest.TestCase):
+    def test_doubled_chords_in_progression(self):
+        progression = [
+            ['C4', 'E4', 'G4', 'C5'],
+            ['F3', 'A3', 'C4', 'F4'],
+            ['G3', 'B3', 'D4', 'F4', 'G4'],
+            ['C4', 'C5'],
+        ]
+        analysis = MusicTheory.analyze_chord_progression(progression, 'C')
+        self.assertEqual(len(analysis), len(progression))
+        self.assertEqual(analysis[-1], "?")
+        self.assertNotIn("?", analysis[:-1])
+
+    def test_matches_per_chord_analysis(self):
+        # Batching pads chords to a common width; that must not change any result
+        rng = random.Random(7)
+        chords = [known_chord(rng) if rng.random() < 0.7 else random_chord(rng) for _ in range(200)]
+        analysis = MusicTheory.analyze_chord_progression(chords, 'D')
+        for chord, roman in zip(chords, analysis):
+            self.assertEqual(roman, MusicTheory.analyze_chord_progression([chord], 'D')[0], chord)
+            if MusicTheory.recognize_chord(chord)[0] is None:
+                self.assertEqual(roman, "?")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import random
+import unittest
+from types import SimpleNamespace
+
+from modules.learning.note_generator import NoteGenerator
+
+
+def reference_note_table(midi_data):
+    """Straightforward per-event parse the vectorized note table must match."""
+    notes = []
+    open_notes = {}
+    for event in midi_data:
+        event_type = event["type"]
+        if event_type == "note_on" and event["velocity"] > 0:
+            # Duration defaults to 0.5 s, kept if no note off follows
+            note = [event["note"], event["time"], event["velocity"], 0.5]
+            notes.append(note)
+            open_notes[event["note"]] = note
+        elif event_type == "note_off" or event_type == "note_on":
+            note = open_notes.pop(event["note"], None)
+            if note is not None:
+                note[3] = event["time"] - note[1]
+    notes.sort(key=lambda note: note[1])
+    return [tuple(note) for note in notes]
+
+
+class TestNoteTable(unittest.TestCase):
+    def setUp(self):
+        config = SimpleNamespace(screen_width=800, screen_height=600, piano_height=100)
+        self.generator = NoteGenerator(config, SimpleNamespace(midi_data=[]))
+
+    def assertMatchesReference(self, midi_data):
+        table = self.generator._build_note_table(midi_data)
+        built = list(
+            zip(
+                table["pitch"].tolist(),
+                table["onset"].tolist(),
+                table["velocity"].tolist(),
+                table["duration"].tolist(),
+            )
+        )
+        self.assertEqual(built, reference_note_table(midi_data))
+
+    def test_overlapping_same_pitch_notes(self):
+        # The second note on re-opens the pitch; the note off ends only that one
+        self.assertMatchesReference(
+            [
+                {"type": "note_on", "note": 60, "velocity": 80, "time": 0.0},
+                {"type": "note_on", "note": 60, "velocity": 90, "time": 0.25},
+                {"type": "note_off", "note": 60, "velocity": 0, "time": 1.0},
+                {"type": "note_off", "note": 60, "velocity": 0, "time": 1.5},
+            ]
+        )
+
+    def test_velocity_zero_note_on_ends_note(self):
+        self.assertMatchesReference(
+            [
+                {"type": "note_on", "note": 64, "velocity": 100, "time": 0.5},
+                {"type": "note_on", "note": 67, "velocity": 100, "time": 0.5},
+                {"type": "note_on", "note": 64, "velocity": 0, "time": 0.75},
+                {"type": "control_change", "control": 64, "value": 127, "time": 0.8},
+                {"type": "note_on", "note": 67, "velocity": 0, "time": 1.25},
+            ]
+        )
+
+    def test_empty_and_unmatched_events(self):
+        self.assertMatchesReference([])
+        self.assertMatchesReference(
+            [
+                {"type": "note_off", "note": 60, "velocity": 0, "time": 0.0},
+                {"type": "note_on", "note": 62, "velocity": 70, "time": 0.1},
+            ]
+        )
+
+    def test_random_event_streams(self):
+        rng = random.Random(1234)
+        for _ in range(200):
+            midi_data = []
+            for _ in range(rng.randint(0, 60)):
+                event_type = rng.choice(["note_on", "note_on", "note_off", "control_change"])
+                midi_data.append(
+                    {
+                        "type": event_type,
+                        "note": rng.randint(58, 64),
+                        "velocity": rng.choice([0, 0, 40, 80, 127]),
+                        # Coarse, unsorted times so onsets tie and arrive out of order
+                        "time": rng.randint(0, 20) / 4,
+                    }
+                )
+            self.assertMatchesReference(midi_data)
+
+
+if __name__ == "__main__":
+    unittest.main()